@@ -0,0 +1,405 @@
+'''Benchmark harness for the mining algorithms.
+
+Runs every itemset, association rule and sequence miner across a grid of
+random datasets and records the wall time, the peak memory and the number of
+results. Results are written as JSON and two result files can be compared to
+detect regressions::
+
+    python -m pymining.bench run -o new.json
+    python -m pymining.bench compare old.json new.json
+'''
+from __future__ import print_function
+import argparse
+from collections import OrderedDict
+import gc
+import itertools
+import json
+import math
+import random
+import sys
+from timeit import default_timer
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2: only the peak RSS is available.
+    tracemalloc = None
+
+from pymining import itemmining, assocrules, seqmining, datagen
+from pymining.budget import max_rss
+from pymining.instrumentation import MiningStats
+from pymining.compat import range
+
+
+RESULTS_VERSION = 1
+
+DEFAULT_GRID = OrderedDict([
+    ('transactions', [500, 2000]),
+    ('density', [0.01, 0.05]),
+    ('support', [0.02, 0.05]),
+    ('avg_length', [10]),
+])
+
+CASE_KEYS = (
+    'algorithm', 'generator', 'transactions', 'density', 'avg_length',
+    'support')
+
+GENERATORS = ('uniform', 'quest')
+
+
+def _fptree_input(transactions, min_support, stats=None):
+    return itemmining.get_fptree(
+        transactions, min_support=min_support, stats=stats)
+
+
+def _relim_input(transactions, min_support, stats=None):
+    return itemmining.get_relim_input(transactions, stats=stats)
+
+
+def _sam_input(transactions, min_support, stats=None):
+    return itemmining.get_sam_input(transactions, stats=stats)
+
+
+def _no_input(dataset, min_support, stats=None):
+    return dataset
+
+
+def _fpgrowth(fptree, min_support, stats=None):
+    return itemmining.fpgrowth(fptree, min_support, False, stats)
+
+
+def _fpgrowth_pruning(fptree, min_support, stats=None):
+    return itemmining.fpgrowth(fptree, min_support, True, stats)
+
+
+def _mine_itemsets(transactions, min_support, stats=None):
+    return itemmining.mine_itemsets(
+        transactions, min_support, 'auto', stats=stats)
+
+
+def _assoc_rules(relim_input, min_support, stats=None):
+    report = itemmining.relim(relim_input, min_support, stats)
+    return assocrules.mine_assoc_rules(report, min_support, 0.5)
+
+
+# name: (dataset kind, input preparation, mining)
+MINERS = OrderedDict([
+    ('sam', ('transactions', _sam_input, itemmining.sam)),
+    ('relim', ('transactions', _relim_input, itemmining.relim)),
+    ('fpgrowth', ('transactions', _fptree_input, _fpgrowth)),
+    ('fpgrowth_pruning', ('transactions', _fptree_input, _fpgrowth_pruning)),
+    ('auto', ('transactions', _no_input, _mine_itemsets)),
+    ('assoc_rules', ('transactions', _relim_input, _assoc_rules)),
+    ('freq_seq', ('sequences', _no_input, seqmining.freq_seq_enum)),
+    ('freq_itemset_seq', (
+        'itemset_sequences', _no_input, seqmining.freq_itemset_seq_enum)),
+])
+
+
+def _random_length(rng, avg_length):
+    return rng.randint(1, max(1, 2 * avg_length - 1))
+
+
+def _get_quest_dataset(kind, size, universe_size, avg_length, seed):
+    # Transactions and elements can't have more items than the universe.
+    avg_length = min(avg_length, universe_size)
+    if kind == 'transactions':
+        return list(datagen.quest_transactions(
+            size, universe_size, avg_length, seed=seed))
+    elif kind == 'sequences':
+        return [
+            [element[0] for element in sequence] for sequence in
+            datagen.quest_sequences(
+                size, universe_size, avg_length, avg_element_length=1,
+                avg_pattern_length=1, seed=seed)]
+    elif kind == 'itemset_sequences':
+        return list(datagen.quest_sequences(
+            size, universe_size, max(1, avg_length / 2.0),
+            avg_element_length=min(2, universe_size), seed=seed))
+    else:
+        raise ValueError('Unknown dataset kind: {0}'.format(kind))
+
+
+def get_dataset(
+        kind, size, density, avg_length, seed=None, generator='uniform'):
+    '''Generates a random dataset of `size` transactions or sequences with
+       `avg_length` items on average. The universe of items is computed so
+       that an item appears, on average, in `density` of the transactions.
+
+       :param kind: 'transactions', 'sequences' or 'itemset_sequences'.
+       :param generator: 'uniform' draws items uniformly, 'quest' uses the
+        Quest-style generators of `pymining.datagen` (planted patterns and
+        skewed item popularity).
+    '''
+    universe_size = max(1, int(round(avg_length / float(density))))
+    if generator == 'quest':
+        return _get_quest_dataset(
+            kind, size, universe_size, avg_length, seed)
+    elif generator != 'uniform':
+        raise ValueError('Unknown generator: {0}'.format(generator))
+
+    rng = random.Random(seed)
+    universe = list(range(universe_size))
+    dataset = []
+    for _ in range(size):
+        length = _random_length(rng, avg_length)
+        if kind == 'transactions':
+            dataset.append(rng.sample(universe, min(length, universe_size)))
+        elif kind == 'sequences':
+            dataset.append([rng.choice(universe) for _ in range(length)])
+        elif kind == 'itemset_sequences':
+            sequence = []
+            while length > 0:
+                element_size = min(length, rng.randint(1, 3))
+                sequence.append(rng.sample(
+                    universe, min(element_size, universe_size)))
+                length -= element_size
+            dataset.append(sequence)
+        else:
+            raise ValueError('Unknown dataset kind: {0}'.format(kind))
+    return dataset
+
+
+def _timed(func, *args):
+    start = default_timer()
+    result = func(*args)
+    return (result, default_timer() - start)
+
+
+def _traced_peak(func, *args):
+    if tracemalloc is None:
+        return None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(*args)
+        (_, peak) = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _collect_stats(prepare, mine, dataset, min_support):
+    stats = MiningStats()
+    mine(prepare(dataset, min_support, stats), min_support, stats)
+    return stats.as_dict()
+
+
+def run_case(
+        algorithm, dataset, min_support, repeat=1, memory=True, stats=False):
+    '''Runs one miner on a dataset and returns a dictionary with the best
+       wall time of `repeat` runs (input preparation and mining), the peak
+       memory traced during a separate run and the number of results.
+       `process_max_rss` is the peak RSS of the whole process in bytes so
+       far, not of this case.
+
+       If `stats` is True, the statistics of another, instrumented, run are
+       added (see `pymining.instrumentation.MiningStats`).
+    '''
+    (_, prepare, mine) = MINERS[algorithm]
+
+    def run():
+        return mine(prepare(dataset, min_support), min_support)
+
+    prepare_time = mine_time = None
+    count = None
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        (prepared, elapsed) = _timed(prepare, dataset, min_support)
+        (output, mine_elapsed) = _timed(mine, prepared, min_support)
+        if prepare_time is None or elapsed + mine_elapsed < \
+                prepare_time + mine_time:
+            (prepare_time, mine_time) = (elapsed, mine_elapsed)
+        count = len(output)
+        del prepared, output
+
+    result = OrderedDict([
+        ('prepare_time', prepare_time),
+        ('mine_time', mine_time),
+        ('time', prepare_time + mine_time),
+        ('peak_memory', _traced_peak(run) if memory else None),
+        # Peak RSS of the whole process: it never decreases, so it only tells
+        # how much memory the largest case run so far needed.
+        ('process_max_rss', max_rss()),
+        ('count', count),
+    ])
+    if stats:
+        result['stats'] = _collect_stats(prepare, mine, dataset, min_support)
+    return result
+
+
+def run_benchmarks(
+        grid=None, algorithms=None, repeat=1, seed=0, memory=True,
+        log=None, generator='uniform', stats=False):
+    '''Runs `algorithms` (default: all miners) on every combination of the
+       parameter `grid` and returns the list of results.
+
+       :param grid: a mapping of parameter to a list of values. Supported
+        parameters are transactions (number of transactions), density,
+        support (relative to the number of transactions) and avg_length.
+       :param log: a function called with a message after each case.
+       :param generator: see `get_dataset`.
+       :param stats: see `run_case`.
+    '''
+    grid = dict(DEFAULT_GRID, **(grid or {}))
+    if algorithms is None:
+        algorithms = list(MINERS)
+    results = []
+    datasets = {}
+    for values in itertools.product(*(grid[key] for key in DEFAULT_GRID)):
+        params = OrderedDict(zip(DEFAULT_GRID, values))
+        min_support = max(
+            1, int(math.ceil(params['support'] * params['transactions'])))
+        for algorithm in algorithms:
+            kind = MINERS[algorithm][0]
+            dataset_key = (
+                kind, params['transactions'], params['density'],
+                params['avg_length'])
+            if dataset_key not in datasets:
+                datasets[dataset_key] = get_dataset(
+                    kind, params['transactions'], params['density'],
+                    params['avg_length'], seed, generator)
+            result = OrderedDict([
+                ('algorithm', algorithm), ('generator', generator)])
+            result.update(params)
+            result['min_support'] = min_support
+            result['seed'] = seed
+            result.update(run_case(
+                algorithm, datasets[dataset_key], min_support, repeat,
+                memory, stats))
+            results.append(result)
+            if log is not None:
+                log(_format_result(result))
+    return results
+
+
+def _format_result(result):
+    return '{0:<18} n={1:<7} density={2:<6} support={3:<6} ' \
+        'time={4:.4f}s peak={5} count={6}'.format(
+            result['algorithm'], result['transactions'], result['density'],
+            result['support'], result['time'], result['peak_memory'],
+            result['count'])
+
+
+def save_results(results, path):
+    '''Writes the results of `run_benchmarks` to a JSON file.'''
+    with open(path, 'w') as output:
+        json.dump(
+            {'version': RESULTS_VERSION, 'python': sys.version,
+             'results': results},
+            output, indent=2)
+
+
+def load_results(path):
+    '''Reads a JSON file written by `save_results`.'''
+    with open(path) as results_file:
+        return json.load(results_file)['results']
+
+
+def compare_results(
+        baseline, current, threshold=0.2, metrics=('time', 'peak_memory'),
+        min_time=0.01):
+    '''Compares two lists of results and returns the regressions: cases
+       where a metric grew by more than `threshold` (relative) or where the
+       number of results differs.
+
+       Timings below `min_time` seconds in the baseline are ignored because
+       they are too noisy.
+
+       :rtype: A list of (case, metric, baseline value, current value).
+    '''
+    baseline_cases = {
+        tuple(result.get(key) for key in CASE_KEYS): result
+        for result in baseline}
+    regressions = []
+    for result in current:
+        case = tuple(result.get(key) for key in CASE_KEYS)
+        old = baseline_cases.get(case)
+        if old is None:
+            continue
+        if old['count'] != result['count']:
+            regressions.append(
+                (case, 'count', old['count'], result['count']))
+        for metric in metrics:
+            (old_value, new_value) = (old.get(metric), result.get(metric))
+            if not old_value or new_value is None:
+                continue
+            if metric.endswith('time') and old_value < min_time:
+                continue
+            if new_value > old_value * (1 + threshold):
+                regressions.append((case, metric, old_value, new_value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m pymining.bench',
+        description='Benchmarks the pymining algorithms.')
+    subparsers = parser.add_subparsers(dest='command')
+
+    run_parser = subparsers.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('-o', '--output', help='JSON result file')
+    run_parser.add_argument(
+        '-a', '--algorithm', action='append', choices=list(MINERS),
+        help='miner to run (repeatable, default: all)')
+    run_parser.add_argument(
+        '--transactions', type=int, nargs='+',
+        default=DEFAULT_GRID['transactions'])
+    run_parser.add_argument(
+        '--density', type=float, nargs='+', default=DEFAULT_GRID['density'])
+    run_parser.add_argument(
+        '--support', type=float, nargs='+', default=DEFAULT_GRID['support'],
+        help='minimal support relative to the number of transactions')
+    run_parser.add_argument(
+        '--avg-length', type=int, nargs='+',
+        default=DEFAULT_GRID['avg_length'])
+    run_parser.add_argument('--repeat', type=int, default=1)
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument(
+        '--generator', choices=GENERATORS, default='uniform',
+        help='dataset generator (default: uniform)')
+    run_parser.add_argument(
+        '--stats', action='store_true',
+        help='add the statistics of an instrumented run to the results')
+    run_parser.add_argument(
+        '--no-memory', action='store_true',
+        help='skip the traced run measuring the peak memory')
+
+    compare_parser = subparsers.add_parser(
+        'compare', help='compare two result files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument(
+        '--threshold', type=float, default=0.2,
+        help='relative increase considered a regression (default: 0.2)')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        grid = {
+            'transactions': args.transactions, 'density': args.density,
+            'support': args.support, 'avg_length': args.avg_length}
+        results = run_benchmarks(
+            grid, args.algorithm, args.repeat, args.seed,
+            not args.no_memory, print, args.generator, args.stats)
+        if args.output:
+            save_results(results, args.output)
+        return 0
+    elif args.command == 'compare':
+        regressions = compare_results(
+            load_results(args.baseline), load_results(args.current),
+            args.threshold)
+        for (case, metric, old_value, new_value) in regressions:
+            print('REGRESSION {0} {1}: {2} -> {3}'.format(
+                ' '.join(str(value) for value in case), metric, old_value,
+                new_value))
+        if not regressions:
+            print('No regression.')
+        return 1 if regressions else 0
+    else:
+        parser.print_help()
+        return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
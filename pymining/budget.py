@@ -0,0 +1,173 @@
+'''Time and memory budgets for the mining algorithms.
+
+Pass a `MiningBudget` as the `budget` argument of a miner. The search checks
+the budget cooperatively and, when a limit is reached, stops and returns the
+results found so far. The budget then tells why the results are incomplete
+and suggests a minimal support that should fit in the budget.
+'''
+import sys
+from timeit import default_timer
+
+try:
+    import resource
+except ImportError:
+    # Windows
+    resource = None
+
+
+class BudgetExceeded(Exception):
+    '''Raised inside the search when a limit is reached. The miners catch it
+       and return the partial results.'''
+    pass
+
+
+class CancellationToken(object):
+    '''Cancels a mining run, e.g., from another thread.'''
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def max_rss():
+    '''Returns the peak resident memory of the process in bytes or None if it
+       is not available.'''
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return usage if sys.platform == 'darwin' else usage * 1024
+
+
+def _memory_usage():
+    '''Returns the resident memory of the process in bytes, its peak if the
+       current value is not available, or None.'''
+    try:
+        with open('/proc/self/statm') as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize()
+    except Exception:
+        return max_rss()
+
+
+class MiningBudget(object):
+    '''Limits of a mining run.
+
+       :param time_limit: maximal number of seconds, counted from the
+        creation of the budget or from the last call to `reset`. Call
+        `reset` before reusing a budget for a new time limit.
+       :param max_itemsets: maximal number of results (item sets or
+        sequences). The search stops when a new result is found once it is
+        reached.
+       :param memory_limit: maximal resident memory of the process in bytes.
+       :param token: a `CancellationToken`.
+       :param check_interval: the memory is only checked every
+        `check_interval` checks.
+
+       After a run, `complete` is False if the results are partial, `reason`
+       is 'time_limit', 'max_itemsets', 'memory_limit' or 'cancelled' and
+       `suggested_support` is an estimation of the minimal support that
+       would have fit in the budget.
+    '''
+
+    def __init__(
+            self, time_limit=None, max_itemsets=None, memory_limit=None,
+            token=None, check_interval=100):
+        self.time_limit = time_limit
+        self.max_itemsets = max_itemsets
+        self.memory_limit = memory_limit
+        self.token = token
+        self.check_interval = check_interval
+        self.reset()
+
+    def reset(self):
+        '''Restarts the clock of the time limit and clears the results.'''
+        self._start = default_timer()
+        self._clear()
+
+    def _clear(self):
+        self.complete = True
+        self.reason = None
+        self.suggested_support = None
+        self.done = 0
+        self.total = 0
+        self._checks = 0
+
+    def elapsed(self):
+        return default_timer() - self._start
+
+    def start_search(self, total):
+        '''Called by the algorithms with the number of top-level items when
+           a search starts. Clears the results of a previous run but not the
+           clock, which also covers the preparation of the input.'''
+        self._clear()
+        self.total = total
+
+    def advance(self):
+        '''Called by the algorithms when a top-level item is processed.'''
+        self.done += 1
+
+    def check(self, found):
+        '''Called by the algorithms with the number of results found so far.
+           Raises `BudgetExceeded` if a limit is reached.'''
+        if self.token is not None and self.token.cancelled:
+            self._stop('cancelled')
+        if self.max_itemsets is not None and found >= self.max_itemsets:
+            self._stop('max_itemsets')
+        if self.time_limit is not None and \
+                default_timer() - self._start > self.time_limit:
+            self._stop('time_limit')
+        if self.memory_limit is not None:
+            self._checks += 1
+            if self._checks >= self.check_interval:
+                self._checks = 0
+                memory = _memory_usage()
+                if memory is not None and memory > self.memory_limit:
+                    self._stop('memory_limit')
+
+    def _stop(self, reason):
+        self.complete = False
+        self.reason = reason
+        raise BudgetExceeded(reason)
+
+    def finish(self, supports, min_support):
+        '''Called by the algorithms with the supports of the results when
+           the search was stopped. Computes `suggested_support`.
+
+           The number of results that would be found with a support s is
+           extrapolated from the results with a support >= s found so far
+           and from the fraction of the top-level items processed. The
+           suggestion is the smallest support whose extrapolated number of
+           results fits in the number of results found so far (or in
+           `max_itemsets`).
+        '''
+        supports = sorted(supports, reverse=True)
+        if not supports:
+            return
+        if self.total:
+            fraction = min(1.0, max(self.done, 0.5) / float(self.total))
+        else:
+            fraction = 1.0
+        target = len(supports)
+        if self.max_itemsets is not None:
+            target = min(target, self.max_itemsets)
+        suggestion = supports[0] + 1
+        for (index, support) in enumerate(supports):
+            if (index + 1) / fraction > target:
+                if support == suggestion:
+                    # Ties: all the results with this support don't fit.
+                    suggestion += 1
+                break
+            suggestion = support
+        self.suggested_support = max(min_support + 1, suggestion)
+
+    def __str__(self):
+        if self.complete:
+            return 'complete'
+        return 'incomplete ({0}), suggested support: {1}'.format(
+            self.reason, self.suggested_support)
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,259 @@
+'''Synthetic transaction and sequence generators modeled after the IBM Quest
+generator described by Agrawal and Srikant.
+
+Transactions are built from a pool of planted patterns (potentially frequent
+itemsets) whose items follow a Zipfian popularity. Consecutive patterns
+share items and patterns are corrupted when they are inserted, so the
+generated baskets are correlated like real ones.
+
+All generators are seeded, yield one transaction (or sequence) at a time and
+never hold the dataset in memory. Items are integers in [0, n_items).
+'''
+from bisect import bisect
+import math
+import random
+
+from pymining.compat import range
+
+
+def _poisson(rng, lam):
+    if lam <= 0:
+        return 0
+    if lam > 30:
+        # Normal approximation, Knuth's method underflows for large values.
+        return max(0, int(round(rng.gauss(lam, math.sqrt(lam)))))
+    limit = math.exp(-lam)
+    k = 0
+    p = rng.random()
+    while p > limit:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+def _cumulative(weights):
+    total = 0.0
+    cumulative = []
+    for weight in weights:
+        total += weight
+        cumulative.append(total)
+    return cumulative
+
+
+def _choose(rng, cumulative):
+    index = bisect(cumulative, rng.random() * cumulative[-1])
+    # Guards against rounding errors on the last bucket.
+    return min(index, len(cumulative) - 1)
+
+
+def _zipf_cumulative(n_items, skew):
+    return _cumulative(1.0 / ((rank + 1) ** skew) for rank in range(n_items))
+
+
+def _get_patterns(
+        rng, n_patterns, avg_pattern_length, item_cumulative, correlation,
+        corruption):
+    n_items = len(item_cumulative)
+    patterns = []
+    previous = []
+    for _ in range(n_patterns):
+        length = min(n_items, max(1, _poisson(rng, avg_pattern_length)))
+        pattern = set()
+        if previous:
+            # Part of the items come from the previous pattern.
+            fraction = min(1.0, rng.expovariate(1.0 / correlation)) \
+                if correlation > 0 else 0.0
+            shared = min(len(previous), int(fraction * length + 0.5))
+            pattern.update(rng.sample(previous, shared))
+        while len(pattern) < length:
+            pattern.add(_choose(rng, item_cumulative))
+        pattern = list(pattern)
+        level = min(1.0, max(0.0, rng.gauss(corruption, 0.1)))
+        patterns.append((pattern, level))
+        previous = pattern
+    weights = _cumulative(rng.expovariate(1.0) for _ in range(n_patterns))
+    return (patterns, weights)
+
+
+# Draws adding no new item before a transaction or an element is given up
+# shorter than its drawn length, e.g., when the planted patterns do not cover
+# enough items.
+_MAX_MISSES = 100
+
+
+def _corrupt(rng, pattern, level):
+    items = list(pattern)
+    # Drop items while a coin lands below the corruption level, but keep
+    # at least one.
+    while len(items) > 1 and rng.random() < level:
+        items.pop(rng.randrange(len(items)))
+    return items
+
+
+def quest_transactions(
+        transaction_number, n_items=1000, avg_length=10, n_patterns=2000,
+        avg_pattern_length=4, correlation=0.5, corruption=0.5, skew=1.0,
+        seed=None):
+    '''Generates `transaction_number` transactions (tuples of item ids) in
+       the style of the IBM Quest generator.
+
+       :param n_items: number of distinct items.
+       :param avg_length: average (Poisson) transaction length.
+       :param n_patterns: number of planted patterns.
+       :param avg_pattern_length: average (Poisson) planted pattern length.
+       :param correlation: mean fraction of items a pattern shares with the
+        previous pattern.
+       :param corruption: mean probability of dropping items when a pattern is
+        inserted in a transaction.
+       :param skew: exponent of the Zipfian item popularity (0 is uniform).
+       :param seed: random seed.
+       :rtype: A generator of tuples.
+    '''
+    rng = random.Random(seed)
+    item_cumulative = _zipf_cumulative(n_items, skew)
+    (patterns, weights) = _get_patterns(
+        rng, n_patterns, avg_pattern_length, item_cumulative, correlation,
+        corruption)
+
+    for _ in range(transaction_number):
+        length = min(n_items, max(1, _poisson(rng, avg_length)))
+        transaction = set()
+        misses = 0
+        while len(transaction) < length and misses < _MAX_MISSES:
+            (pattern, level) = patterns[_choose(rng, weights)]
+            items = _corrupt(rng, pattern, level)
+            if transaction and len(transaction) + len(items) > length and \
+                    rng.random() < 0.5:
+                # Quest moves the overflowing pattern to the next
+                # transaction, we drop it half of the time.
+                break
+            previous_length = len(transaction)
+            transaction.update(items)
+            if len(transaction) == previous_length:
+                misses += 1
+        yield tuple(transaction)
+
+
+def quest_sequences(
+        sequence_number, n_items=1000, avg_elements=10,
+        avg_element_length=2.5, n_seq_patterns=5000,
+        avg_seq_pattern_elements=4, n_patterns=25000, avg_pattern_length=1.25,
+        correlation=0.25, corruption=0.75, skew=1.0, seed=None):
+    '''Generates `sequence_number` sequences of itemsets (lists of tuples of
+       item ids) in the style of the IBM Quest sequence generator.
+
+       Sequential patterns are sequences of planted itemset patterns.
+       Customer sequences are built by concatenating corrupted sequential
+       patterns.
+
+       :param n_items: number of distinct items.
+       :param avg_elements: average (Poisson) number of elements per sequence.
+       :param avg_element_length: average (Poisson) number of items per
+        element.
+       :param n_seq_patterns: number of planted sequential patterns.
+       :param avg_seq_pattern_elements: average number of elements of a
+        sequential pattern.
+       :param n_patterns: number of planted itemset patterns.
+       :param avg_pattern_length: average length of an itemset pattern.
+       :param correlation: see `quest_transactions`.
+       :param corruption: see `quest_transactions`.
+       :param skew: see `quest_transactions`.
+       :param seed: random seed.
+       :rtype: A generator of lists of tuples.
+    '''
+    rng = random.Random(seed)
+    item_cumulative = _zipf_cumulative(n_items, skew)
+    (patterns, pattern_weights) = _get_patterns(
+        rng, n_patterns, avg_pattern_length, item_cumulative, correlation,
+        corruption)
+    seq_patterns = []
+    for _ in range(n_seq_patterns):
+        length = max(1, _poisson(rng, avg_seq_pattern_elements))
+        seq_patterns.append(
+            [_choose(rng, pattern_weights) for _ in range(length)])
+    seq_weights = _cumulative(
+        rng.expovariate(1.0) for _ in range(n_seq_patterns))
+
+    for _ in range(sequence_number):
+        n_elements = max(1, _poisson(rng, avg_elements))
+        sequence = []
+        while len(sequence) < n_elements:
+            seq_pattern = seq_patterns[_choose(rng, seq_weights)]
+            for pattern_index in seq_pattern:
+                if len(sequence) >= n_elements:
+                    break
+                (pattern, level) = patterns[pattern_index]
+                element = set(_corrupt(rng, pattern, level))
+                size = min(
+                    n_items, max(1, _poisson(rng, avg_element_length)))
+                misses = 0
+                while len(element) < size and misses < _MAX_MISSES:
+                    # Noise
+                    item = _choose(rng, item_cumulative)
+                    if item in element:
+                        misses += 1
+                    else:
+                        element.add(item)
+                sequence.append(tuple(element))
+        yield sequence
+
+
+def chunks(iterable, size):
+    '''Groups the elements of `iterable` in lists of `size` elements (the
+       last list may be shorter).'''
+    chunk = []
+    for element in iterable:
+        chunk.append(element)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_transactions(transactions, path):
+    '''Streams transactions of integers to `path`, one transaction per line
+       with space separated items (the SPMF format).'''
+    with open(path, 'w') as output:
+        for transaction in transactions:
+            output.write(' '.join(str(item) for item in transaction))
+            output.write('\n')
+
+
+def read_transactions(path):
+    '''Yields the transactions written by `write_transactions` as tuples of
+       integers.'''
+    with open(path) as input_file:
+        for line in input_file:
+            yield tuple(int(item) for item in line.split())
+
+
+def write_sequences(sequences, path):
+    '''Streams sequences of itemsets of integers to `path` in the SPMF
+       format: one sequence per line, -1 ends an element and -2 ends a
+       sequence.'''
+    with open(path, 'w') as output:
+        for sequence in sequences:
+            for element in sequence:
+                output.write(' '.join(str(item) for item in element))
+                output.write(' -1 ')
+            output.write('-2\n')
+
+
+def read_sequences(path):
+    '''Yields the sequences written by `write_sequences` as lists of tuples
+       of integers.'''
+    with open(path) as input_file:
+        for line in input_file:
+            sequence = []
+            element = []
+            for token in line.split():
+                item = int(token)
+                if item == -1:
+                    sequence.append(tuple(element))
+                    element = []
+                elif item == -2:
+                    break
+                else:
+                    element.append(item)
+            yield sequence
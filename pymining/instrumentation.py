@@ -0,0 +1,170 @@
+'''Opt-in instrumentation of the mining algorithms.
+
+Pass a `MiningStats` instance as the `stats` argument of an input function
+(e.g., `get_fptree`) or of a miner (e.g., `fpgrowth`) to collect timings and
+search statistics. The algorithms only test whether `stats` is None when it
+is not given, so there is no other overhead.
+'''
+from collections import OrderedDict
+from contextlib import contextmanager
+import logging
+from timeit import default_timer
+
+
+class MiningStats(object):
+    '''Collects the statistics of one or more mining steps.
+
+       :param progress: a function called with (done, total, elapsed, eta)
+        while the top-level items of the search are processed. eta is the
+        estimated number of seconds until the end of the search.
+       :param progress_interval: minimal number of seconds between two calls
+        to `progress` (the last item is always reported).
+    '''
+
+    def __init__(self, progress=None, progress_interval=1.0):
+        # phase name: seconds
+        self.timings = OrderedDict()
+        # Number of recursive calls of the search and deepest one.
+        self.calls = 0
+        self.max_depth = 0
+        # Conditional (projected) databases or trees built during the search
+        # and their total and largest sizes.
+        self.conditional_databases = 0
+        self.conditional_size = 0
+        self.max_conditional_size = 0
+        # FP-tree nodes allocated
+        self.nodes = 0
+        # Infrequent items (branches) not explored
+        self.pruned = 0
+        # Free form information, e.g., the algorithm chosen by mine_itemsets
+        self.info = OrderedDict()
+
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.done = 0
+        self.total = 0
+        self._search_start = None
+        self._last_progress = None
+
+    @contextmanager
+    def phase(self, name):
+        '''Context manager timing a phase. Timings of phases with the same
+           name are added.'''
+        start = default_timer()
+        try:
+            yield self
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + \
+                default_timer() - start
+
+    def enter(self, depth):
+        self.calls += 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def conditional(self, size):
+        self.conditional_databases += 1
+        self.conditional_size += size
+        if size > self.max_conditional_size:
+            self.max_conditional_size = size
+
+    def allocate(self, nodes):
+        self.nodes += nodes
+
+    def prune(self, count=1):
+        self.pruned += count
+
+    def start_search(self, total):
+        '''Called by the algorithms with the number of top-level items.'''
+        self.done = 0
+        self.total = total
+        self._search_start = self._last_progress = default_timer()
+
+    def advance(self):
+        '''Called by the algorithms when a top-level item is processed.'''
+        self.done += 1
+        if self.progress is None:
+            return
+        now = default_timer()
+        if self.done < self.total and \
+                now - self._last_progress < self.progress_interval:
+            return
+        self._last_progress = now
+        self.progress(self.done, self.total, now - self._search_start,
+                      self.eta(now))
+
+    def eta(self, now=None):
+        '''Returns the estimated number of seconds left in the search,
+           assuming top-level items take the same time, or None if no item
+           has been processed yet.'''
+        if not self.done or self._search_start is None:
+            return None
+        if now is None:
+            now = default_timer()
+        elapsed = now - self._search_start
+        return elapsed / self.done * max(0, self.total - self.done)
+
+    def as_dict(self):
+        '''Returns the statistics as a dictionary, e.g., to send them to a
+           metrics system or to store them with benchmark results.'''
+        return OrderedDict([
+            ('timings', OrderedDict(self.timings)),
+            ('calls', self.calls),
+            ('max_depth', self.max_depth),
+            ('conditional_databases', self.conditional_databases),
+            ('conditional_size', self.conditional_size),
+            ('max_conditional_size', self.max_conditional_size),
+            ('nodes', self.nodes),
+            ('pruned', self.pruned),
+            ('info', OrderedDict(self.info)),
+        ])
+
+    def __str__(self):
+        return ', '.join(
+            '{0}={1}'.format(key, value)
+            for (key, value) in self.as_dict().items())
+
+    def __repr__(self):
+        return self.__str__()
+
+
+@contextmanager
+def _no_phase():
+    yield None
+
+
+def phase(stats, name):
+    '''Returns `stats.phase(name)` or a context manager doing nothing if
+       `stats` is None.'''
+    if stats is None:
+        return _no_phase()
+    return stats.phase(name)
+
+
+def start_search(total, *observers):
+    '''Calls `start_search(total)` on the observers (`MiningStats` or
+       `MiningBudget`) that are not None.'''
+    for observer in observers:
+        if observer is not None:
+            observer.start_search(total)
+
+
+def advance(*observers):
+    '''Calls `advance()` on the observers that are not None.'''
+    for observer in observers:
+        if observer is not None:
+            observer.advance()
+
+
+def log_progress(logger=None, level=logging.INFO):
+    '''Returns a progress function for `MiningStats` that logs the progress
+       with `logger` (default: the pymining logger).'''
+    if logger is None:
+        logger = logging.getLogger('pymining')
+
+    def progress(done, total, elapsed, eta):
+        logger.log(
+            level, 'Processed %d/%d items in %.1fs (ETA %.1fs)', done, total,
+            elapsed, eta if eta is not None else 0.0)
+
+    return progress
@@ -1,25 +1,66 @@
 from collections import defaultdict, deque, OrderedDict
+from itertools import chain
+from operator import itemgetter
+from pymining.budget import BudgetExceeded
+from pymining.instrumentation import advance, phase, start_search
 
 
 def _sort_transactions_by_freq(
         transactions, key_func, reverse_int=False,
-        reverse_ext=False, sort_ext=True):
-    key_seqs = [{key_func(i) for i in sequence} for sequence in transactions]
-    frequencies = get_frequencies(key_seqs)
+        reverse_ext=False, sort_ext=True, exclude=None, weighted=False):
+    key_seqs = _get_key_seqs(transactions, key_func, exclude, weighted)
+    frequencies = _get_key_frequencies(key_seqs)
+    asorted_seqs = _sort_key_seqs(
+        key_seqs, frequencies, reverse_int, reverse_ext, sort_ext)
+    return (asorted_seqs, frequencies)
+
+
+def _get_key_seqs(transactions, key_func, exclude=None, weighted=False):
+    # Identical transactions are grouped: {frozenset(keys): weight}
+    key_seqs = defaultdict(int)
+    if exclude:
+        exclude = frozenset(exclude)
+    if weighted:
+        for (transaction, weight) in transactions:
+            key_seq = frozenset(map(key_func, transaction))
+            if exclude:
+                key_seq = key_seq.difference(exclude)
+            key_seqs[key_seq] += weight
+    elif exclude:
+        for transaction in transactions:
+            key_seqs[frozenset(map(key_func, transaction)).difference(
+                exclude)] += 1
+    else:
+        for transaction in transactions:
+            key_seqs[frozenset(map(key_func, transaction))] += 1
+    return key_seqs
+
+
+def _get_key_frequencies(key_seqs):
+    frequencies = defaultdict(int)
+    for (key_seq, weight) in key_seqs.items():
+        for key in key_seq:
+            frequencies[key] += weight
+    return frequencies
+
 
+def _sort_key_seqs(
+        key_seqs, frequencies, reverse_int=False, reverse_ext=False,
+        sort_ext=True):
+    # Returns [(sorted transaction, weight)]
     asorted_seqs = []
-    for key_seq in key_seqs:
-        if not key_seq:
+    for (key_seq, weight) in key_seqs.items():
+        if not key_seq or not weight:
             continue
         # Sort each transaction (infrequent key first)
         l = [(frequencies[i], i) for i in key_seq]
         l.sort(reverse=reverse_int)
-        asorted_seqs.append(tuple(l))
+        asorted_seqs.append((tuple(l), weight))
     # Sort all transactions. Those with infrequent key first, first
     if sort_ext:
-        asorted_seqs.sort(reverse=reverse_ext)
+        asorted_seqs.sort(key=itemgetter(0), reverse=reverse_ext)
 
-    return (asorted_seqs, frequencies)
+    return asorted_seqs
 
 
 def get_frequencies(transactions):
@@ -36,56 +77,135 @@ def get_frequencies(transactions):
     return frequencies
 
 
-def get_sam_input(transactions, key_func=None):
+class _ItemsetConstraints(object):
+    '''Constraints on the frequent item sets checked during the search.'''
+
+    def __init__(
+            self, min_len=1, max_len=None, must_contain=None,
+            antimonotone=None, monotone=None):
+        self.min_len = min_len
+        self.max_len = max_len
+        self.must_contain = frozenset(must_contain) \
+            if must_contain is not None else None
+        self.antimonotone = antimonotone
+        self.monotone = monotone
+
+    def accept(self, itemset):
+        '''False if the item set and all its supersets must be skipped.'''
+        return self.antimonotone is None or self.antimonotone(itemset)
+
+    def report(self, itemset):
+        return len(itemset) >= self.min_len and \
+            (self.must_contain is None or
+             not self.must_contain.isdisjoint(itemset)) and \
+            (self.monotone is None or self.monotone(itemset))
+
+    def extend(self, itemset):
+        '''False if the supersets of the item set can't be reported because
+           they would be too long.'''
+        return self.max_len is None or len(itemset) < self.max_len
+
+    def complete(self, itemset, keys):
+        '''False if neither the item set nor the frequent `keys` of its
+           conditional database contain a required item.'''
+        if self.must_contain is None or \
+                not self.must_contain.isdisjoint(itemset):
+            return True
+        return not self.must_contain.isdisjoint(keys)
+
+
+def _get_constraints(
+        min_len=1, max_len=None, must_contain=None, antimonotone=None,
+        monotone=None):
+    if min_len <= 1 and max_len is None and must_contain is None and \
+            antimonotone is None and monotone is None:
+        return None
+    return _ItemsetConstraints(
+        min_len, max_len, must_contain, antimonotone, monotone)
+
+
+def get_sam_input(
+        transactions, key_func=None, stats=None, exclude=None,
+        weighted=False):
     '''Given a list of transactions and a key function, returns a data
        structure used as the input of the sam algorithm.
 
        :param transactions: a sequence of sequences. [ [transaction items...]]
+        or, if `weighted` is True, a sequence of (transaction, count).
        :param key_func: a function that returns a comparable key for a
         transaction item.
+       :param stats: an optional `MiningStats` timing the sort and build
+        phases.
+       :param exclude: keys removed from the transactions.
+       :param weighted: True if each transaction comes with its count.
     '''
 
     if key_func is None:
         def key_func(e):
             return e
 
-    (asorted_seqs, _) = _sort_transactions_by_freq(transactions, key_func)
+    with phase(stats, 'sort'):
+        (asorted_seqs, _) = _sort_transactions_by_freq(
+            transactions, key_func, exclude=exclude, weighted=weighted)
+
+    with phase(stats, 'build'):
+        return _build_sam_input(asorted_seqs)
 
-    # Group same transactions together
-    sam_input = deque()
-    visited = {}
-    current = 0
-    for seq in asorted_seqs:
-        if seq not in visited:
-            sam_input.append((1, seq))
-            visited[seq] = current
-            current += 1
-        else:
-            i = visited[seq]
-            (count, oldseq) = sam_input[i]
-            sam_input[i] = (count + 1, oldseq)
-    return sam_input
 
+def _build_sam_input(asorted_seqs):
+    # Same transactions are already grouped together
+    return deque((count, seq) for (seq, count) in asorted_seqs)
 
-def sam(sam_input, min_support=2):
+
+def sam(
+        sam_input, min_support=2, stats=None, min_len=1, max_len=None,
+        must_contain=None, antimonotone=None, monotone=None, budget=None):
     '''Finds frequent item sets of items appearing in a list of transactions
        based on the Split and Merge algorithm by Christian Borgelt.
 
        :param sam_input: The input of the algorithm. Must come from
         `get_sam_input`.
        :param min_support: The minimal support of a set to be included.
+       :param stats: an optional `MiningStats` collecting search statistics.
+       :param min_len: The minimal length of a set to be included.
+       :param max_len: The maximal length of a set. Longer sets are not
+        explored.
+       :param must_contain: Only sets containing at least one of these keys
+        are included. Branches without such key are not explored.
+       :param antimonotone: a function called with a frozenset. If it returns
+        False, the set and all its supersets are skipped.
+       :param monotone: a function called with a frozenset. If it returns
+        False, the set is not included but its supersets are explored.
+       :param budget: an optional `MiningBudget`. If a limit is reached, the
+        search stops and the sets found so far are returned.
        :rtype: A set containing the frequent item sets and their support.
     '''
     fis = set()
     report = {}
-    _sam(sam_input, fis, report, min_support)
+    constraints = _get_constraints(
+        min_len, max_len, must_contain, antimonotone, monotone)
+    with phase(stats, 'search'):
+        if stats is not None or budget is not None:
+            start_search(
+                len({item for (_, seq) in sam_input for item in seq}),
+                stats, budget)
+        try:
+            _sam(sam_input, fis, report, min_support, stats, constraints,
+                 budget)
+        except BudgetExceeded:
+            budget.finish(report.values(), min_support)
     return report
 
 
-def _sam(sam_input, fis, report, min_support):
+def _sam(sam_input, fis, report, min_support, stats=None, constraints=None,
+         budget=None):
     n = 0
     a = deque(sam_input)
+    if stats is not None:
+        stats.enter(len(fis))
     while len(a) > 0 and len(a[0][1]) > 0:
+        if budget is not None:
+            budget.check(len(report))
         b = deque()
         s = 0
         i = a[0][1][0]
@@ -114,9 +234,29 @@ def _sam(sam_input, fis, report, min_support):
         a = d
         if s >= min_support:
             fis.add(i[1])
-            report[frozenset(fis)] = s
-            n = n + 1 + _sam(c, fis, report, min_support)
+            itemset = frozenset(fis)
+            if constraints is None:
+                report[itemset] = s
+                if stats is not None:
+                    stats.conditional(len(c))
+                n = n + 1 + _sam(
+                    c, fis, report, min_support, stats, budget=budget)
+            elif constraints.accept(itemset):
+                if constraints.report(itemset):
+                    report[itemset] = s
+                n += 1
+                if constraints.extend(itemset) and constraints.complete(
+                        itemset, (k[1] for (_, seq) in c for k in seq)):
+                    if stats is not None:
+                        stats.conditional(len(c))
+                    n += _sam(
+                        c, fis, report, min_support, stats, constraints,
+                        budget)
             fis.remove(i[1])
+        elif stats is not None:
+            stats.prune()
+        if not fis:
+            advance(stats, budget)
     return n
 
 
@@ -140,13 +280,20 @@ def _get_key_map(frequencies):
     return key_map
 
 
-def get_relim_input(transactions, key_func=None):
+def get_relim_input(
+        transactions, key_func=None, stats=None, exclude=None,
+        weighted=False):
     '''Given a list of transactions and a key function, returns a data
        structure used as the input of the relim algorithm.
 
        :param transactions: a sequence of sequences. [ [transaction items...]]
+        or, if `weighted` is True, a sequence of (transaction, count).
        :param key_func: a function that returns a comparable key for a
         transaction item.
+       :param stats: an optional `MiningStats` timing the sort and build
+        phases.
+       :param exclude: keys removed from the transactions.
+       :param weighted: True if each transaction comes with its count.
     '''
 
     # Data Structure
@@ -164,30 +311,29 @@ def get_relim_input(transactions, key_func=None):
         def key_func(e):
             return e
 
-    (asorted_seqs, frequencies) = _sort_transactions_by_freq(
-        transactions, key_func)
-    key_map = _get_key_map(frequencies)
+    with phase(stats, 'sort'):
+        (asorted_seqs, frequencies) = _sort_transactions_by_freq(
+            transactions, key_func, exclude=exclude, weighted=weighted)
+
+    with phase(stats, 'build'):
+        return _build_relim_input(asorted_seqs, frequencies)
 
+
+def _build_relim_input(asorted_seqs, frequencies):
+    key_map = _get_key_map(frequencies)
     relim_input = _new_relim_input(len(key_map), key_map)
-    for seq in asorted_seqs:
-        if not seq:
-            continue
+    for (seq, weight) in asorted_seqs:
         index = key_map[seq[0]]
         ((count, char), lists) = relim_input[index]
-        rest = seq[1:]
-        found = False
-        for i, (rest_count, rest_seq) in enumerate(lists):
-            if rest_seq == rest:
-                lists[i] = (rest_count + 1, rest_seq)
-                found = True
-                break
-        if not found:
-            lists.append((1, rest))
-        relim_input[index] = ((count + 1, char), lists)
+        # Transactions are grouped so rests with the same prefix are unique.
+        lists.append((weight, seq[1:]))
+        relim_input[index] = ((count + weight, char), lists)
     return (relim_input, key_map)
 
 
-def relim(rinput, min_support=2):
+def relim(
+        rinput, min_support=2, stats=None, min_len=1, max_len=None,
+        must_contain=None, antimonotone=None, monotone=None, budget=None):
     '''Finds frequent item sets of items appearing in a list of transactions
        based on Recursive Elimination algorithm by Christian Borgelt.
 
@@ -198,40 +344,92 @@ def relim(rinput, min_support=2):
        :param rinput: The input of the algorithm. Must come from
         `get_relim_input`.
        :param min_support: The minimal support of a set to be included.
+       :param stats: an optional `MiningStats` collecting search statistics.
+       :param min_len: see `sam`.
+       :param max_len: see `sam`.
+       :param must_contain: see `sam`.
+       :param antimonotone: see `sam`.
+       :param monotone: see `sam`.
+       :param budget: see `sam`.
        :rtype: A set containing the frequent item sets and their support.
     '''
     fis = set()
     report = {}
-    _relim(rinput, fis, report, min_support)
+    constraints = _get_constraints(
+        min_len, max_len, must_contain, antimonotone, monotone)
+    with phase(stats, 'search'):
+        start_search(len(rinput[0]), stats, budget)
+        try:
+            _relim(
+                rinput, fis, report, min_support, stats, constraints, budget)
+        except BudgetExceeded:
+            budget.finish(report.values(), min_support)
     return report
 
 
-def _relim(rinput, fis, report, min_support):
+def _relim_cond_input(a, key_map):
+    b = _new_relim_input(len(a) - 1, key_map)
+    rest_lists = a[-1][1]
+
+    for (count, rest) in rest_lists:
+        if not rest:
+            continue
+        k = rest[0]
+        index = key_map[k]
+        new_rest = rest[1:]
+        # Only add this rest if it's not empty!
+        ((k_count, k), lists) = b[index]
+        if len(new_rest) > 0:
+            lists.append((count, new_rest))
+        b[index] = ((k_count + count, k), lists)
+    return b
+
+
+def _relim(
+        rinput, fis, report, min_support, stats=None, constraints=None,
+        budget=None):
     (relim_input, key_map) = rinput
     n = 0
     a = relim_input
+    if stats is not None:
+        stats.enter(len(fis))
     while len(a) > 0:
+        if budget is not None:
+            budget.check(len(report))
         item = a[-1][0][1]
         s = a[-1][0][0]
         if s >= min_support:
             fis.add(item[1])
-            report[frozenset(fis)] = s
-            b = _new_relim_input(len(a) - 1, key_map)
-            rest_lists = a[-1][1]
-
-            for (count, rest) in rest_lists:
-                if not rest:
-                    continue
-                k = rest[0]
-                index = key_map[k]
-                new_rest = rest[1:]
-                # Only add this rest if it's not empty!
-                ((k_count, k), lists) = b[index]
-                if len(new_rest) > 0:
-                    lists.append((count, new_rest))
-                b[index] = ((k_count + count, k), lists)
-            n = n + 1 + _relim((b, key_map), fis, report, min_support)
+            itemset = frozenset(fis)
+            if constraints is None:
+                report[itemset] = s
+                b = _relim_cond_input(a, key_map)
+                if stats is not None:
+                    stats.conditional(sum(len(lists) for (_, lists) in b))
+                n = n + 1 + _relim(
+                    (b, key_map), fis, report, min_support, stats,
+                    budget=budget)
+            elif constraints.accept(itemset):
+                if constraints.report(itemset):
+                    report[itemset] = s
+                n += 1
+                if constraints.extend(itemset):
+                    b = _relim_cond_input(a, key_map)
+                    # Counts only cover the first key of the rests.
+                    keys = chain(
+                        (k[1] for ((k_count, k), _) in b if k_count),
+                        (k[1] for (_, lists) in b for (_, rest) in lists
+                         for k in rest))
+                    if constraints.complete(itemset, keys):
+                        if stats is not None:
+                            stats.conditional(
+                                sum(len(lists) for (_, lists) in b))
+                        n += _relim(
+                            (b, key_map), fis, report, min_support, stats,
+                            constraints, budget)
             fis.remove(item[1])
+        elif stats is not None:
+            stats.prune()
 
         rest_lists = a[-1][1]
         for (count, rest) in rest_lists:
@@ -245,6 +443,8 @@ def _relim(rinput, fis, report, min_support):
                 lists.append((count, new_rest))
             a[index] = ((k_count + count, k), lists)
         a.pop()
+        if not fis:
+            advance(stats, budget)
     return n
 
 
@@ -259,7 +459,7 @@ class FPNode(object):
         self.count = 0
         self.next_node = None
 
-    def add_path(self, path, index, length, heads, last_insert):
+    def add_path(self, path, index, length, heads, last_insert, count=1):
         if index >= length:
             return
 
@@ -270,10 +470,10 @@ class FPNode(object):
             child = self.children[child_key]
         except Exception:
             child = self._create_child(child_key, heads, last_insert)
-        child.count += 1
-        heads[child_key][1] += 1
+        child.count += count
+        heads[child_key][1] += count
 
-        child.add_path(path, index, length, heads, last_insert)
+        child.add_path(path, index, length, heads, last_insert, count)
 
     def _create_child(self, child_key, heads, last_insert):
         child = FPNode(child_key, self)
@@ -376,31 +576,49 @@ class FPNode(object):
         return self.__str__()
 
 
-def get_fptree(transactions, key_func=None, min_support=2):
+def get_fptree(
+        transactions, key_func=None, min_support=2, stats=None,
+        exclude=None, weighted=False):
     '''Given a list of transactions and a key function, returns a data
        structure used as the input of the relim algorithm.
 
        :param transactions: a sequence of sequences. [ [transaction items...]]
+        or, if `weighted` is True, a sequence of (transaction, count).
        :param key_func: a function that returns a comparable key for a
         transaction item.
        :param min_support: minimum support.
+       :param stats: an optional `MiningStats` timing the sort and build
+        phases and counting the allocated nodes.
+       :param exclude: keys removed from the transactions. They never appear
+        in the tree or in the conditional trees.
+       :param weighted: True if each transaction comes with its count.
     '''
 
     if key_func is None:
         def key_func(e):
             return e
 
-    asorted_seqs, frequencies = _sort_transactions_by_freq(
-        transactions, key_func, True, False, False)
+    with phase(stats, 'sort'):
+        asorted_seqs, frequencies = _sort_transactions_by_freq(
+            transactions, key_func, True, False, False, exclude, weighted)
+
+    with phase(stats, 'build'):
+        return _build_fptree(asorted_seqs, min_support, stats)
+
+
+def _build_fptree(asorted_seqs, min_support, stats=None):
     transactions = [
-        [item[1] for item in aseq if item[0] >= min_support] for
-        aseq in asorted_seqs]
+        ([item[1] for item in aseq if item[0] >= min_support], weight) for
+        (aseq, weight) in asorted_seqs]
 
     root = FPNode(FPNode.root_key, None)
     heads = {}
     last_insert = {}
-    for transaction in transactions:
-        root.add_path(transaction, 0, len(transaction), heads, last_insert)
+    for (transaction, weight) in transactions:
+        root.add_path(
+            transaction, 0, len(transaction), heads, last_insert, weight)
+    if stats is not None:
+        stats.allocate(_count_nodes(heads.values()) + 1)
 
     # Here, v[1] is = to the frequency
     sorted_heads = sorted(heads.values(), key=lambda v: (v[1], v[0].key))
@@ -411,6 +629,15 @@ def get_fptree(transactions, key_func=None, min_support=2):
     return (root, new_heads)
 
 
+def _count_nodes(heads):
+    count = 0
+    for (node, _) in heads:
+        while node is not None:
+            count += 1
+            node = node.next_node
+    return count
+
+
 def _init_heads(orig_heads):
     new_heads = OrderedDict()
     for key in orig_heads:
@@ -426,7 +653,7 @@ def _create_cond_tree(head_node, new_heads, pruning):
             None, head_node.count, visited, new_heads,
             last_insert, True)
         head_node = head_node.next_node
-    return new_heads
+    return len(visited)
 
 
 def _prune_cond_tree(heads, min_support):
@@ -451,7 +678,10 @@ def _prune_cond_tree(heads, min_support):
         merged_now = {}
 
 
-def fpgrowth(fptree, min_support=2, pruning=False):
+def fpgrowth(
+        fptree, min_support=2, pruning=False, stats=None, min_len=1,
+        max_len=None, must_contain=None, antimonotone=None, monotone=None,
+        budget=None):
     '''Finds frequent item sets of items appearing in a list of transactions
        based on FP-Growth by Han et al.
 
@@ -459,28 +689,240 @@ def fpgrowth(fptree, min_support=2, pruning=False):
         `get_fptree`.
        :param min_support: The minimal support of a set.
        :param pruning: Perform a pruning operation. Default to False.
+       :param stats: an optional `MiningStats` collecting search statistics.
+       :param min_len: see `sam`.
+       :param max_len: see `sam`. No conditional tree is built for sets of
+        this length.
+       :param must_contain: see `sam`.
+       :param antimonotone: see `sam`.
+       :param monotone: see `sam`.
+       :param budget: see `sam`.
        :rtype: A set containing the frequent item sets and their support.
     '''
     fis = set()
     report = {}
-    _fpgrowth(fptree, fis, report, min_support, pruning)
+    constraints = _get_constraints(
+        min_len, max_len, must_contain, antimonotone, monotone)
+    with phase(stats, 'search'):
+        start_search(len(fptree[1]), stats, budget)
+        try:
+            _fpgrowth(
+                fptree, fis, report, min_support, pruning, stats,
+                constraints, budget)
+        except BudgetExceeded:
+            budget.finish(report.values(), min_support)
     return report
 
 
-def _fpgrowth(fptree, fis, report, min_support=2, pruning=True):
+def _fp_cond_tree(heads, head_node, min_support, pruning, stats):
+    new_heads = _init_heads(heads)
+    nodes = _create_cond_tree(head_node, new_heads, pruning)
+    if pruning:
+        _prune_cond_tree(new_heads, min_support)
+    if stats is not None:
+        stats.allocate(nodes)
+        stats.conditional(nodes)
+    return new_heads
+
+
+def _fpgrowth(
+        fptree, fis, report, min_support=2, pruning=True, stats=None,
+        constraints=None, budget=None):
     (_, heads) = fptree
     n = 0
+    if stats is not None:
+        stats.enter(len(fis))
     for (head_node, head_support) in heads.values():
         if head_support < min_support:
+            if stats is not None:
+                stats.prune()
+            if not fis:
+                advance(stats, budget)
             continue
+        if budget is not None:
+            budget.check(len(report))
 
         fis.add(head_node.key)
-        report[frozenset(fis)] = head_support
-        new_heads = _init_heads(heads)
-        _create_cond_tree(head_node, new_heads, pruning)
-        if pruning:
-            _prune_cond_tree(new_heads, min_support)
-        n = n + 1 + _fpgrowth(
-            (None, new_heads), fis, report, min_support, pruning)
+        itemset = frozenset(fis)
+        if constraints is None:
+            report[itemset] = head_support
+            new_heads = _fp_cond_tree(
+                heads, head_node, min_support, pruning, stats)
+            n = n + 1 + _fpgrowth(
+                (None, new_heads), fis, report, min_support, pruning, stats,
+                budget=budget)
+        elif constraints.accept(itemset):
+            if constraints.report(itemset):
+                report[itemset] = head_support
+            n += 1
+            if constraints.extend(itemset):
+                new_heads = _fp_cond_tree(
+                    heads, head_node, min_support, pruning, stats)
+                keys = (
+                    key for (key, (_, support)) in new_heads.items()
+                    if support >= min_support)
+                if constraints.complete(itemset, keys):
+                    n += _fpgrowth(
+                        (None, new_heads), fis, report, min_support,
+                        pruning, stats, constraints, budget)
         fis.remove(head_node.key)
+        if not fis:
+            advance(stats, budget)
     return n
+
+
+ALGORITHMS = ('sam', 'relim', 'fpgrowth', 'fpgrowth_pruning')
+
+
+def _get_dataset_stats(key_seqs, frequencies, min_support):
+    transaction_number = sum(key_seqs.values())
+    item_number = len(frequencies)
+    total_length = sum(frequencies.values())
+    distinct = len(key_seqs)
+    avg_length = float(total_length) / transaction_number \
+        if transaction_number else 0.0
+    return OrderedDict([
+        ('transactions', transaction_number),
+        ('items', item_number),
+        ('avg_length', avg_length),
+        ('density', avg_length / item_number if item_number else 0.0),
+        ('frequent_items', sum(
+            1 for frequency in frequencies.values()
+            if frequency >= min_support)),
+        ('duplicate_ratio', 1.0 - float(distinct) / transaction_number
+            if transaction_number else 0.0),
+    ])
+
+
+def get_dataset_stats(
+        transactions, min_support=2, key_func=None, weighted=False):
+    '''Computes statistics used by `mine_itemsets` to choose an algorithm:
+       number of transactions and items, average length, density (average
+       length divided by the number of items), number of frequent items and
+       ratio of duplicate transactions.
+
+       :param transactions: a sequence of sequences. [ [transaction items...]]
+        or, if `weighted` is True, a sequence of (transaction, count).
+       :param min_support: The minimal support of a set.
+       :param key_func: a function that returns a comparable key for a
+        transaction item.
+       :param weighted: True if each transaction comes with its count.
+    '''
+    if key_func is None:
+        def key_func(e):
+            return e
+
+    key_seqs = _get_key_seqs(transactions, key_func, weighted=weighted)
+    return _get_dataset_stats(
+        key_seqs, _get_key_frequencies(key_seqs), min_support)
+
+
+def choose_algorithm(dataset_stats):
+    '''Given the statistics computed by `get_dataset_stats`, returns the
+       name of the algorithm expected to be the fastest and the reason of
+       this choice.
+
+       The rules come from `pymining.bench` runs: FP-Growth drops infrequent
+       items when building its tree and wins when few items are frequent,
+       SaM wins on very dense data or when it can merge many duplicate
+       transactions, and Relim wins otherwise.
+    '''
+    items = dataset_stats['items']
+    if not items:
+        return ('relim', 'empty dataset')
+    frequent_ratio = float(dataset_stats['frequent_items']) / items
+    density = dataset_stats['density']
+    if frequent_ratio < 0.2:
+        return ('fpgrowth', 'only {0:.0%} of the items are frequent'.format(
+            frequent_ratio))
+    elif density >= 0.4:
+        return ('sam', 'dense dataset ({0:.2f})'.format(density))
+    elif density >= 0.2 and dataset_stats['duplicate_ratio'] >= 0.5:
+        return ('sam', '{0:.0%} of duplicate transactions'.format(
+            dataset_stats['duplicate_ratio']))
+    else:
+        return ('relim', 'default')
+
+
+def mine_itemsets(
+        transactions, min_support=2, algorithm='auto', key_func=None,
+        stats=None, min_len=1, max_len=None, must_contain=None,
+        exclude=None, antimonotone=None, monotone=None, weighted=False,
+        budget=None):
+    '''Finds frequent item sets with one of the algorithms of this module.
+
+       With `algorithm='auto'`, statistics of the transactions are computed
+       while they are prepared and the algorithm predicted to be the fastest
+       is used (see `choose_algorithm`).
+
+       The algorithm, the reason of the choice and the dataset statistics are
+       recorded in `stats.info` if `stats` is given.
+
+       :param transactions: a sequence of sequences. [ [transaction items...]]
+        or, if `weighted` is True, a sequence of (transaction, count).
+       :param min_support: The minimal support of a set to be included.
+       :param algorithm: 'auto', 'sam', 'relim', 'fpgrowth' or
+        'fpgrowth_pruning'.
+       :param key_func: a function that returns a comparable key for a
+        transaction item.
+       :param stats: an optional `MiningStats`.
+       :param min_len: see `sam`.
+       :param max_len: see `sam`.
+       :param must_contain: see `sam`.
+       :param exclude: keys removed from the transactions.
+       :param antimonotone: see `sam`.
+       :param monotone: see `sam`.
+       :param weighted: True if each transaction comes with its count.
+       :param budget: see `sam`. The time limit also covers the preparation
+        of the transactions.
+       :rtype: A dictionary containing the frequent item sets and their
+        support.
+    '''
+    if algorithm != 'auto' and algorithm not in ALGORITHMS:
+        raise ValueError('Unknown algorithm: {0}'.format(algorithm))
+
+    if key_func is None:
+        def key_func(e):
+            return e
+
+    with phase(stats, 'sort'):
+        key_seqs = _get_key_seqs(transactions, key_func, exclude, weighted)
+        frequencies = _get_key_frequencies(key_seqs)
+        dataset_stats = _get_dataset_stats(
+            key_seqs, frequencies, min_support)
+        if algorithm == 'auto':
+            (algorithm, reason) = choose_algorithm(dataset_stats)
+        else:
+            reason = 'requested'
+        if stats is not None:
+            stats.info['algorithm'] = algorithm
+            stats.info['reason'] = reason
+            stats.info['dataset'] = dataset_stats
+
+        if algorithm.startswith('fpgrowth'):
+            asorted_seqs = _sort_key_seqs(
+                key_seqs, frequencies, True, False, False)
+        else:
+            asorted_seqs = _sort_key_seqs(key_seqs, frequencies)
+        del key_seqs
+
+    with phase(stats, 'build'):
+        if algorithm == 'sam':
+            mining_input = _build_sam_input(asorted_seqs)
+        elif algorithm == 'relim':
+            mining_input = _build_relim_input(asorted_seqs, frequencies)
+        else:
+            mining_input = _build_fptree(asorted_seqs, min_support, stats)
+        del asorted_seqs
+
+    constraints = (min_len, max_len, must_contain, antimonotone, monotone)
+    if algorithm == 'sam':
+        return sam(
+            mining_input, min_support, stats, *constraints, budget=budget)
+    elif algorithm == 'relim':
+        return relim(
+            mining_input, min_support, stats, *constraints, budget=budget)
+    else:
+        return fpgrowth(
+            mining_input, min_support, algorithm == 'fpgrowth_pruning',
+            stats, *constraints, budget=budget)
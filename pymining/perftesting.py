@@ -43,6 +43,17 @@ def get_default_sequences():
     return ('caabc', 'abcb', 'cabc', 'abbca')
 
 
+def get_default_itemset_sequences():
+    '''Returns a small list of sequences of itemsets (from the PrefixSpan
+       paper). For testing purpose.'''
+    return (
+            ('a', 'abc', 'ac', 'd', 'cf'),
+            ('ad', 'c', 'bc', 'ae'),
+            ('ef', 'ab', 'df', 'c', 'b'),
+            ('e', 'g', 'af', 'c', 'b', 'c'),
+            )
+
+
 def get_random_transactions(
         transaction_number=500,
         max_item_per_transaction=100, max_key_length=50,
@@ -131,6 +142,8 @@ def test_itemset_perf(perf_round=10, sparse=True, seed=None):
 
        The `seed` parameter can be used to obtain the same sample across
        multiple calls.
+
+       See `pymining.bench` for a more thorough benchmark.
     '''
     random.seed(seed)
 
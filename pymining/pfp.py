@@ -0,0 +1,371 @@
+'''Sharded parallel FP-Growth (PFP) by Li et al.
+
+The driver counts the global item frequencies, splits the frequent items in
+groups (one per shard) and sends each transaction's group-dependent prefixes
+to the shards: for each group, the prefix of the transaction (sorted by
+decreasing frequency) ending at its least frequent item of the group. Each
+shard is mined independently with `get_fptree` and `fpgrowth` and only
+reports the item sets whose least frequent item belongs to its group, so the
+reports of the shards are disjoint and their union is the complete result.
+
+Shards are run by a transport:
+
+- `SerialTransport` mines the shards one after the other in this process.
+- `ProcessTransport` mines them in a pool of local processes.
+- `DirectoryTransport` writes shard files to a directory shared with
+  workers started with ``python -m pymining.pfp worker DIRECTORY``, on this
+  machine or on other nodes, and waits for their result files.
+'''
+import argparse
+import os
+import pickle
+import socket
+import subprocess
+import sys
+import time
+import traceback
+import uuid
+
+from pymining.compat import range
+from pymining.instrumentation import phase
+from pymining.itemmining import (
+    _get_key_seqs, _get_key_frequencies, get_fptree, fpgrowth)
+
+
+# Protocol 2 can be read by Python 2 and 3 workers.
+PICKLE_PROTOCOL = 2
+
+STOP_FILE = 'stop'
+
+
+def get_groups(frequencies, min_support, shard_number):
+    '''Ranks the frequent keys by decreasing frequency (the F-list) and
+       assigns them to `shard_number` groups in a round-robin way so the
+       frequent keys, which have the largest conditional trees, are spread
+       over the shards.
+
+       :param frequencies: {key: frequency}, e.g., from `get_frequencies`.
+       :rtype: A tuple (ranks, groups): {key: rank} and a list of key lists.
+    '''
+    flist = sorted(
+        ((frequency, key) for (key, frequency) in frequencies.items()
+         if frequency >= min_support), reverse=True)
+    ranks = {}
+    groups = [[] for _ in range(shard_number)]
+    for (rank, (_, key)) in enumerate(flist):
+        ranks[key] = rank
+        groups[rank % shard_number].append(key)
+    return (ranks, groups)
+
+
+def get_shards(
+        transactions, min_support=2, shard_number=4, key_func=None,
+        weighted=False):
+    '''Computes the shards of the transactions.
+
+       :param transactions: a sequence of sequences. [ [transaction items...]]
+        or, if `weighted` is True, a sequence of (transaction, count).
+       :param min_support: minimum support.
+       :param shard_number: number of shards.
+       :param key_func: a function that returns a comparable key for a
+        transaction item.
+       :param weighted: True if each transaction comes with its count.
+       :rtype: A list of shards. A shard is a dictionary with its `group` of
+        keys, the `ranks` of the frequent keys, the `min_support` and its
+        weighted `transactions` [(prefix, count)].
+    '''
+    if key_func is None:
+        def key_func(e):
+            return e
+
+    key_seqs = _get_key_seqs(transactions, key_func, weighted=weighted)
+    frequencies = _get_key_frequencies(key_seqs)
+    (ranks, groups) = get_groups(frequencies, min_support, shard_number)
+    key_groups = {}
+    for (index, group) in enumerate(groups):
+        for key in group:
+            key_groups[key] = index
+
+    shard_transactions = [[] for _ in range(shard_number)]
+    for (key_seq, weight) in key_seqs.items():
+        if not weight:
+            continue
+        prefix = sorted(
+            (ranks[key], key) for key in key_seq if key in ranks)
+        prefix = tuple(key for (_, key) in prefix)
+        emitted = set()
+        # From the least frequent key: each group gets the longest prefix
+        # ending with one of its keys.
+        for j in range(len(prefix) - 1, -1, -1):
+            index = key_groups[prefix[j]]
+            if index not in emitted:
+                emitted.add(index)
+                shard_transactions[index].append((prefix[:j + 1], weight))
+    del key_seqs
+
+    return [
+        {'shard': index, 'group': groups[index], 'ranks': ranks,
+         'min_support': min_support,
+         'transactions': shard_transactions[index]}
+        for index in range(shard_number)]
+
+
+def mine_shard(shard, pruning=False):
+    '''Mines a shard computed by `get_shards`.
+
+       :param pruning: see `fpgrowth`.
+       :rtype: A dictionary containing the frequent item sets whose least
+        frequent key belongs to the group of the shard and their support.
+    '''
+    group = frozenset(shard['group'])
+    if not group:
+        return {}
+    ranks = shard['ranks']
+    fptree = get_fptree(
+        shard['transactions'], min_support=shard['min_support'],
+        weighted=True)
+    report = fpgrowth(
+        fptree, shard['min_support'], pruning, must_contain=group)
+    return dict(
+        (itemset, support) for (itemset, support) in report.items()
+        if max(itemset, key=ranks.__getitem__) in group)
+
+
+def _mine_shard_task(args):
+    (shard, pruning) = args
+    return mine_shard(shard, pruning)
+
+
+class SerialTransport(object):
+    '''Mines the shards in this process.'''
+
+    def run(self, shards, pruning=False):
+        return [mine_shard(shard, pruning) for shard in shards]
+
+
+class ProcessTransport(object):
+    '''Mines the shards in a pool of local processes.
+
+       :param processes: number of processes (default: number of CPUs).
+    '''
+
+    def __init__(self, processes=None):
+        self.processes = processes
+
+    def run(self, shards, pruning=False):
+        import multiprocessing
+        pool = multiprocessing.Pool(self.processes)
+        try:
+            return pool.map(
+                _mine_shard_task, [(shard, pruning) for shard in shards],
+                chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+
+
+def _write_atomic(obj, path):
+    tmp_path = '{0}.{1}.tmp'.format(path, os.getpid())
+    with open(tmp_path, 'wb') as output:
+        pickle.dump(obj, output, PICKLE_PROTOCOL)
+    os.rename(tmp_path, path)
+
+
+def _read(path):
+    with open(path, 'rb') as input_file:
+        return pickle.load(input_file)
+
+
+class DirectoryTransport(object):
+    '''Exchanges shard files with workers through a directory.
+
+       For each shard, the driver writes a ``<job>-<shard>.task`` file. A
+       worker claims a task by renaming it, mines it and writes a
+       ``<job>-<shard>.result`` file (or a ``.error`` file with the
+       traceback). Files are pickled, so the directory must only be
+       writable by trusted users.
+
+       :param directory: directory shared with the workers. It is created
+        if needed.
+       :param workers: number of local worker processes started for each
+        run. With 0, workers must be started separately, e.g., on other
+        nodes sharing the directory.
+       :param poll_interval: seconds between two scans of the directory.
+       :param timeout: maximal number of seconds to wait for the results.
+    '''
+
+    def __init__(
+            self, directory, workers=0, poll_interval=0.1, timeout=None):
+        self.directory = directory
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+    def run(self, shards, pruning=False):
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        job = uuid.uuid4().hex
+        names = ['{0}-{1}'.format(job, shard['shard']) for shard in shards]
+        for (name, shard) in zip(names, shards):
+            _write_atomic(
+                {'shard': shard, 'pruning': pruning},
+                os.path.join(self.directory, name + '.task'))
+
+        processes = [
+            subprocess.Popen(
+                [sys.executable, '-m', 'pymining.pfp', 'worker',
+                 self.directory])
+            for _ in range(self.workers)]
+        try:
+            return self._wait(names, processes)
+        finally:
+            for process in processes:
+                if process.poll() is None:
+                    process.terminate()
+                process.wait()
+
+    def _wait(self, names, processes):
+        results = {}
+        start = time.time()
+        while True:
+            # Checked before the scan: the workers write their results
+            # before exiting.
+            exited = bool(processes) and all(
+                process.poll() is not None for process in processes)
+            for name in names:
+                if name in results:
+                    continue
+                path = os.path.join(self.directory, name)
+                if os.path.exists(path + '.error'):
+                    with open(path + '.error') as error_file:
+                        message = error_file.read()
+                    os.remove(path + '.error')
+                    raise RuntimeError(
+                        'Shard {0} failed:\n{1}'.format(name, message))
+                if os.path.exists(path + '.result'):
+                    results[name] = _read(path + '.result')
+                    os.remove(path + '.result')
+            if len(results) == len(names):
+                return [results[name] for name in names]
+            if exited:
+                raise RuntimeError(
+                    'The workers exited before mining all the shards: '
+                    '{0}'.format([process.returncode
+                                  for process in processes]))
+            if self.timeout is not None and \
+                    time.time() - start > self.timeout:
+                raise RuntimeError(
+                    'Timeout while waiting for {0} shards'.format(
+                        len(names) - len(results)))
+            time.sleep(self.poll_interval)
+
+
+def _claim_task(directory):
+    claim_suffix = '.{0}-{1}'.format(socket.gethostname(), os.getpid())
+    for file_name in sorted(os.listdir(directory)):
+        if not file_name.endswith('.task'):
+            continue
+        path = os.path.join(directory, file_name)
+        claimed_path = path + claim_suffix
+        try:
+            os.rename(path, claimed_path)
+        except OSError:
+            # Another worker was faster.
+            continue
+        return (file_name[:-len('.task')], claimed_path)
+    return (None, None)
+
+
+def work(directory, wait=False, poll_interval=0.5):
+    '''Mines the shard files of a `DirectoryTransport`.
+
+       :param directory: directory shared with the driver.
+       :param wait: if False, returns when no task is left. Otherwise, waits
+        for new tasks until a file named ``stop`` is created in the
+        directory.
+       :param poll_interval: seconds between two scans of the directory.
+       :rtype: The number of shards mined.
+    '''
+    count = 0
+    while True:
+        (name, claimed_path) = _claim_task(directory)
+        if name is None:
+            if not wait or \
+                    os.path.exists(os.path.join(directory, STOP_FILE)):
+                return count
+            time.sleep(poll_interval)
+            continue
+        path = os.path.join(directory, name)
+        try:
+            task = _read(claimed_path)
+            report = mine_shard(task['shard'], task['pruning'])
+            _write_atomic(report, path + '.result')
+        except Exception:
+            with open(path + '.error', 'w') as error_file:
+                error_file.write(traceback.format_exc())
+        os.remove(claimed_path)
+        count += 1
+
+
+def pfpgrowth(
+        transactions, min_support=2, shard_number=4, transport=None,
+        key_func=None, pruning=False, weighted=False, stats=None):
+    '''Finds frequent item sets with the sharded parallel FP-Growth.
+
+       :param transactions: a sequence of sequences. [ [transaction items...]]
+        or, if `weighted` is True, a sequence of (transaction, count).
+       :param min_support: The minimal support of a set.
+       :param shard_number: number of shards.
+       :param transport: `SerialTransport` (default), `ProcessTransport`,
+        `DirectoryTransport` or any object with a `run(shards, pruning)`
+        method returning the reports of `mine_shard` for the shards.
+       :param key_func: a function that returns a comparable key for a
+        transaction item.
+       :param pruning: see `fpgrowth`.
+       :param weighted: True if each transaction comes with its count.
+       :param stats: an optional `MiningStats` timing the shard and search
+        phases.
+       :rtype: A dictionary containing the frequent item sets and their
+        support.
+    '''
+    if transport is None:
+        transport = SerialTransport()
+    with phase(stats, 'shard'):
+        shards = get_shards(
+            transactions, min_support, shard_number, key_func, weighted)
+    with phase(stats, 'search'):
+        reports = transport.run(shards, pruning)
+    report = {}
+    for shard_report in reports:
+        report.update(shard_report)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m pymining.pfp',
+        description='Runs the workers of the sharded FP-Growth.')
+    subparsers = parser.add_subparsers(dest='command')
+
+    worker_parser = subparsers.add_parser(
+        'worker', help='mine the shard files of a directory')
+    worker_parser.add_argument('directory')
+    worker_parser.add_argument(
+        '--wait', action='store_true',
+        help='wait for new shards until a "stop" file is created')
+    worker_parser.add_argument(
+        '--poll-interval', type=float, default=0.5,
+        help='seconds between two scans of the directory (default: 0.5)')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'worker':
+        work(args.directory, args.wait, args.poll_interval)
+        return 0
+    else:
+        parser.print_help()
+        return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,44 +1,75 @@
 from collections import defaultdict
+from pymining.compat import range
+from pymining.budget import BudgetExceeded
+from pymining.instrumentation import advance, phase, start_search
 
 
-def freq_seq_enum(sequences, min_support):
+def freq_seq_enum(
+        sequences, min_support, stats=None, weighted=False, budget=None):
     '''Enumerates all frequent sequences.
 
-       :param sequences: A sequence of sequences.
+       :param sequences: A sequence of sequences or, if `weighted` is True, a
+        sequence of (sequence, count).
        :param min_support: The minimal support of a set to be included.
+       :param stats: an optional `MiningStats` collecting search statistics.
+       :param weighted: True if each sequence comes with its count.
+       :param budget: an optional `MiningBudget`. If a limit is reached, the
+        search stops and the sequences found so far are returned.
        :rtype: A set of (frequent_sequence, support).
     '''
     freq_seqs = set()
-    _freq_seq(sequences, tuple(), 0, min_support, freq_seqs)
+    # sdb: [(sequence, count)]
+    if weighted:
+        sdb = [(entry, count) for (entry, count) in sequences if count]
+    else:
+        sdb = [(entry, 1) for entry in sequences]
+    with phase(stats, 'search'):
+        try:
+            _freq_seq(
+                sdb, tuple(), 0, min_support, freq_seqs, stats, budget)
+        except BudgetExceeded:
+            budget.finish(
+                (support for (_, support) in freq_seqs), min_support)
     return freq_seqs
 
 
-def _freq_seq(sdb, prefix, prefix_support, min_support, freq_seqs):
+def _freq_seq(sdb, prefix, prefix_support, min_support, freq_seqs,
+              stats=None, budget=None):
     if prefix:
         freq_seqs.add((prefix, prefix_support))
-    locally_frequents = _local_freq_items(sdb, prefix, min_support)
+    locally_frequents = _local_freq_items(sdb, prefix, min_support, stats)
+    if stats is not None:
+        stats.enter(len(prefix))
+    if not prefix:
+        start_search(len(locally_frequents), stats, budget)
     if not locally_frequents:
         return
     for (item, support) in locally_frequents:
+        if budget is not None:
+            budget.check(len(freq_seqs))
         new_prefix = prefix + (item,)
         new_sdb = _project(sdb, new_prefix)
-        _freq_seq(new_sdb, new_prefix, support, min_support, freq_seqs)
+        if stats is not None:
+            stats.conditional(len(new_sdb))
+        _freq_seq(new_sdb, new_prefix, support, min_support, freq_seqs,
+                  stats, budget)
+        if not prefix:
+            advance(stats, budget)
 
 
-def _local_freq_items(sdb, prefix, min_support):
+def _local_freq_items(sdb, prefix, min_support, stats=None):
     items = defaultdict(int)
     freq_items = []
-    for entry in sdb:
-        visited = set()
-        for element in entry:
-            if element not in visited:
-                items[element] += 1
-                visited.add(element)
+    for (entry, count) in sdb:
+        for element in set(entry):
+            items[element] += count
     # Sorted is optional. Just useful for debugging for now.
     for item in items:
         support = items[item]
         if support >= min_support:
             freq_items.append((item, support))
+    if stats is not None:
+        stats.prune(len(items) - len(freq_items))
     return freq_items
 
 
@@ -47,7 +78,7 @@ def _project(sdb, prefix):
     if not prefix:
         return sdb
     current_prefix_item = prefix[-1]
-    for entry in sdb:
+    for (entry, count) in sdb:
         j = 0
         projection = None
         for item in entry:
@@ -56,5 +87,183 @@ def _project(sdb, prefix):
                 break
             j += 1
         if projection:
-            new_sdb.append(projection)
+            new_sdb.append((projection, count))
     return new_sdb
+
+
+def freq_itemset_seq_enum(
+        sequences, min_support, stats=None, weighted=False, budget=None):
+    '''Enumerates all frequent sequences of itemsets based on PrefixSpan by
+       Pei et al.
+
+       Each sequence is a sequence of elements and each element is an
+       iterable of items occurring together (e.g., a basket). Patterns are
+       grown by I-extensions (adding an item to the last element) and by
+       S-extensions (appending a new element). Items must be comparable.
+
+       The sequences are encoded once and the projected databases only
+       store a position in each sequence, so no suffix is ever copied.
+
+       :param sequences: A sequence of sequences of itemsets.
+        [ [ (items...), (items...) ] ] or, if `weighted` is True, a sequence
+        of (sequence, count).
+       :param min_support: The minimal support of a sequence to be included.
+       :param stats: an optional `MiningStats` timing the encoding (build)
+        and the search and collecting search statistics.
+       :param weighted: True if each sequence comes with its count.
+       :param budget: see `freq_seq_enum`.
+       :rtype: A set of (frequent_sequence, support). A frequent sequence is
+        a tuple of elements and each element is a sorted tuple of items.
+    '''
+    if not weighted:
+        sequences = ((sequence, 1) for sequence in sequences)
+    with phase(stats, 'build'):
+        (sdb, weights, items) = _encode_itemset_sdb(sequences, min_support)
+    freq_seqs = set()
+    # Position -1: no element has been matched yet.
+    projection = [(index, -1) for index in range(len(sdb))]
+    with phase(stats, 'search'):
+        try:
+            _freq_itemset_seq(
+                sdb, weights, projection, tuple(), min_support, items,
+                freq_seqs, stats, budget)
+        except BudgetExceeded:
+            budget.finish(
+                (support for (_, support) in freq_seqs), min_support)
+    return freq_seqs
+
+
+def _encode_itemset_sdb(sequences, min_support):
+    elements_db = []
+    weights = []
+    for (sequence, count) in sequences:
+        if count:
+            elements_db.append([frozenset(element) for element in sequence])
+            weights.append(count)
+
+    # Items that are not frequent on their own can't be part of a frequent
+    # sequence so they are removed before mining.
+    supports = defaultdict(int)
+    for (elements, count) in zip(elements_db, weights):
+        for item in frozenset().union(*elements):
+            supports[item] += count
+    items = sorted(item for item in supports if supports[item] >= min_support)
+    item_ids = {item: item_id for (item_id, item) in enumerate(items)}
+
+    sdb = []
+    for elements in elements_db:
+        encoded = []
+        for element in elements:
+            encoded_element = frozenset(
+                item_ids[item] for item in element if item in item_ids)
+            if encoded_element:
+                encoded.append(encoded_element)
+        sdb.append(tuple(encoded))
+    return (sdb, weights, items)
+
+
+def _decode_itemset_seq(prefix, items):
+    return tuple(
+        tuple(items[item_id] for item_id in sorted(element))
+        for element in prefix)
+
+
+def _freq_itemset_seq(
+        sdb, weights, projection, prefix, min_support, items, freq_seqs,
+        stats=None, budget=None):
+    last = prefix[-1] if prefix else None
+    (i_items, s_items) = _local_freq_itemset_items(
+        sdb, weights, projection, last)
+    if stats is not None:
+        stats.enter(len(prefix))
+    if not prefix:
+        # The empty prefix only has S-extensions.
+        start_search(len(s_items), stats, budget)
+
+    for item in sorted(i_items):
+        support = i_items[item]
+        if support < min_support:
+            if stats is not None:
+                stats.prune()
+            continue
+        if budget is not None:
+            budget.check(len(freq_seqs))
+        new_last = last.union((item,))
+        new_prefix = prefix[:-1] + (new_last,)
+        freq_seqs.add((_decode_itemset_seq(new_prefix, items), support))
+        new_projection = _project_itemset_i(sdb, projection, new_last)
+        if stats is not None:
+            stats.conditional(len(new_projection))
+        _freq_itemset_seq(
+            sdb, weights, new_projection, new_prefix, min_support, items,
+            freq_seqs, stats, budget)
+
+    for item in sorted(s_items):
+        support = s_items[item]
+        if support < min_support:
+            if stats is not None:
+                stats.prune()
+            if not prefix:
+                advance(stats, budget)
+            continue
+        if budget is not None:
+            budget.check(len(freq_seqs))
+        new_prefix = prefix + (frozenset((item,)),)
+        freq_seqs.add((_decode_itemset_seq(new_prefix, items), support))
+        new_projection = _project_itemset_s(sdb, projection, item)
+        if stats is not None:
+            stats.conditional(len(new_projection))
+        _freq_itemset_seq(
+            sdb, weights, new_projection, new_prefix, min_support, items,
+            freq_seqs, stats, budget)
+        if not prefix:
+            advance(stats, budget)
+
+
+def _local_freq_itemset_items(sdb, weights, projection, last):
+    i_items = defaultdict(int)
+    s_items = defaultdict(int)
+    last_max = max(last) if last else -1
+    for (index, position) in projection:
+        sequence = sdb[index]
+        length = len(sequence)
+        i_visited = set()
+        s_visited = set()
+        if last:
+            # The prefix may also end at any later element containing the
+            # last element of the prefix.
+            for j in range(position, length):
+                element = sequence[j]
+                if last <= element:
+                    i_visited.update(
+                        item for item in element if item > last_max)
+        for j in range(position + 1, length):
+            s_visited.update(sequence[j])
+        count = weights[index]
+        for item in i_visited:
+            i_items[item] += count
+        for item in s_visited:
+            s_items[item] += count
+    return (i_items, s_items)
+
+
+def _project_itemset_i(sdb, projection, new_last):
+    new_projection = []
+    for (index, position) in projection:
+        sequence = sdb[index]
+        for j in range(position, len(sequence)):
+            if new_last <= sequence[j]:
+                new_projection.append((index, j))
+                break
+    return new_projection
+
+
+def _project_itemset_s(sdb, projection, item):
+    new_projection = []
+    for (index, position) in projection:
+        sequence = sdb[index]
+        for j in range(position + 1, len(sequence)):
+            if item in sequence[j]:
+                new_projection.append((index, j))
+                break
+    return new_projection
@@ -0,0 +1,309 @@
+'''Snapshots of the prepared inputs of the itemset miners.
+
+`get_fptree`, `get_relim_input` and `get_sam_input` can take a large share
+of the mining time. Their results can be saved once and loaded by every
+worker or after a restart:
+
+- an FP-tree is stored as flat arrays of parents, items, counts and next
+  nodes in the header table lists, plus the header table;
+- the relim input is stored as the counts of its prefix lists and flat
+  arrays of rests;
+- the SaM input is stored as flat arrays of transaction groups.
+
+Items are replaced by their index in an item dictionary. The file starts with
+a small header, the arrays are aligned on 8 bytes and the item dictionary and
+the table of contents are pickled at the end of the file. Trees are rebuilt
+iteratively, so the depth of a tree is not limited by the recursion limit.
+
+The loaded inputs are ordinary Python objects private to each process: they
+are not shared between the processes loading the same snapshot.
+'''
+from array import array
+from collections import deque, OrderedDict
+import gc
+import pickle
+import struct
+import sys
+
+from pymining.compat import range
+from pymining.itemmining import FPNode
+
+
+MAGIC = b'PYMINSNP'
+VERSION = 1
+
+# magic, version, table of contents offset and length
+_HEADER = struct.Struct('<8sIQQ')
+
+# Protocol 2 can be read by Python 2 and 3.
+PICKLE_PROTOCOL = 2
+
+try:
+    array('q')
+    _COUNT_TYPECODE = 'q'
+except ValueError:
+    # Python 2
+    _COUNT_TYPECODE = 'l'
+
+_INDEX_TYPECODE = 'i'
+
+
+def _index_array(values=()):
+    return array(_INDEX_TYPECODE, values)
+
+
+def _count_array(values=()):
+    return array(_COUNT_TYPECODE, values)
+
+
+def _align(output):
+    padding = -output.tell() % 8
+    if padding:
+        output.write(b'\0' * padding)
+
+
+def _write(path, kind, keys, sections):
+    with open(path, 'wb') as output:
+        output.write(_HEADER.pack(MAGIC, VERSION, 0, 0))
+        contents = []
+        for (name, values) in sections:
+            _align(output)
+            contents.append(
+                (name, values.typecode, output.tell(), len(values)))
+            values.tofile(output)
+        toc_offset = output.tell()
+        pickle.dump(
+            {'kind': kind, 'keys': keys, 'byteorder': sys.byteorder,
+             'sections': contents},
+            output, PICKLE_PROTOCOL)
+        toc_length = output.tell() - toc_offset
+        output.seek(0)
+        output.write(_HEADER.pack(MAGIC, VERSION, toc_offset, toc_length))
+
+
+def save_fptree(fptree, path):
+    '''Saves an FP-tree computed by `get_fptree`.'''
+    (root, heads) = fptree
+    key_ids = {}
+    keys = []
+    node_ids = {root: 0}
+    parents = _index_array([-1])
+    items = _index_array([-1])
+    counts = _count_array([0])
+    nodes = [root]
+    # Parents are stored before their children.
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        parent_id = node_ids[node]
+        for child in node.children.values():
+            try:
+                key_id = key_ids[child.key]
+            except KeyError:
+                key_id = key_ids[child.key] = len(keys)
+                keys.append(child.key)
+            node_ids[child] = len(nodes)
+            nodes.append(child)
+            parents.append(parent_id)
+            items.append(key_id)
+            counts.append(child.count)
+            stack.append(child)
+    next_nodes = _index_array(
+        node_ids[node.next_node] if node.next_node is not None else -1
+        for node in nodes)
+
+    head_items = _index_array()
+    head_nodes = _index_array()
+    head_supports = _count_array()
+    for (key, (head_node, support)) in heads.items():
+        head_items.append(key_ids[key])
+        head_nodes.append(node_ids[head_node])
+        head_supports.append(support)
+
+    _write(path, 'fptree', keys, [
+        ('parents', parents), ('items', items), ('counts', counts),
+        ('next_nodes', next_nodes), ('head_items', head_items),
+        ('head_nodes', head_nodes), ('head_supports', head_supports)])
+
+
+def _load_fptree(keys, sections):
+    parents = sections['parents']
+    items = sections['items']
+    counts = sections['counts']
+    next_nodes = sections['next_nodes']
+
+    root = FPNode(FPNode.root_key, None)
+    nodes = [root]
+    for index in range(1, len(parents)):
+        parent = nodes[parents[index]]
+        key = keys[items[index]]
+        node = FPNode(key, parent)
+        node.count = counts[index]
+        parent.children[key] = node
+        nodes.append(node)
+    for (node, next_index) in zip(nodes, next_nodes):
+        if next_index >= 0:
+            node.next_node = nodes[next_index]
+
+    heads = OrderedDict()
+    for (key_id, node_index, support) in zip(
+            sections['head_items'], sections['head_nodes'],
+            sections['head_supports']):
+        heads[keys[key_id]] = (nodes[node_index], support)
+    return (root, heads)
+
+
+def save_relim_input(rinput, path):
+    '''Saves the input computed by `get_relim_input`.'''
+    (relim_input, key_map) = rinput
+    keys = [key for (_, key) in key_map]
+    frequencies = _count_array(frequency for (frequency, _) in key_map)
+    entry_items = _index_array()
+    entry_counts = _count_array()
+    entry_sizes = _index_array()
+    rest_weights = _count_array()
+    rest_lengths = _index_array()
+    rest_items = _index_array()
+    for ((count, item), lists) in relim_input:
+        entry_items.append(key_map[item])
+        entry_counts.append(count)
+        entry_sizes.append(len(lists))
+        for (weight, rest) in lists:
+            rest_weights.append(weight)
+            rest_lengths.append(len(rest))
+            rest_items.extend(key_map[rest_item] for rest_item in rest)
+
+    _write(path, 'relim', keys, [
+        ('frequencies', frequencies), ('entry_items', entry_items),
+        ('entry_counts', entry_counts), ('entry_sizes', entry_sizes),
+        ('rest_weights', rest_weights), ('rest_lengths', rest_lengths),
+        ('rest_items', rest_items)])
+
+
+def _load_relim_input(keys, sections):
+    items = [
+        (frequency, key)
+        for (frequency, key) in zip(sections['frequencies'], keys)]
+    key_map = OrderedDict()
+    for (index, item) in enumerate(items):
+        key_map[item] = index
+
+    rest_weights = sections['rest_weights']
+    rest_lengths = sections['rest_lengths']
+    rest_items = sections['rest_items']
+    relim_input = []
+    rest_index = 0
+    position = 0
+    for (item_id, count, size) in zip(
+            sections['entry_items'], sections['entry_counts'],
+            sections['entry_sizes']):
+        lists = []
+        for _ in range(size):
+            end = position + rest_lengths[rest_index]
+            lists.append((
+                rest_weights[rest_index],
+                tuple(items[i] for i in rest_items[position:end])))
+            position = end
+            rest_index += 1
+        relim_input.append(((count, items[item_id]), lists))
+    return (relim_input, key_map)
+
+
+def save_sam_input(sam_input, path):
+    '''Saves the input computed by `get_sam_input`.'''
+    item_ids = {}
+    keys = []
+    frequencies = _count_array()
+    weights = _count_array()
+    lengths = _index_array()
+    seq_items = _index_array()
+    for (weight, seq) in sam_input:
+        weights.append(weight)
+        lengths.append(len(seq))
+        for item in seq:
+            try:
+                item_id = item_ids[item]
+            except KeyError:
+                item_id = item_ids[item] = len(keys)
+                keys.append(item[1])
+                frequencies.append(item[0])
+            seq_items.append(item_id)
+
+    _write(path, 'sam', keys, [
+        ('frequencies', frequencies), ('weights', weights),
+        ('lengths', lengths), ('items', seq_items)])
+
+
+def _load_sam_input(keys, sections):
+    items = [
+        (frequency, key)
+        for (frequency, key) in zip(sections['frequencies'], keys)]
+    seq_items = sections['items']
+    sam_input = deque()
+    position = 0
+    for (weight, length) in zip(sections['weights'], sections['lengths']):
+        end = position + length
+        sam_input.append(
+            (weight, tuple(items[i] for i in seq_items[position:end])))
+        position = end
+    return sam_input
+
+
+_LOADERS = {
+    'fptree': _load_fptree,
+    'relim': _load_relim_input,
+    'sam': _load_sam_input,
+}
+
+
+def _read_sections(input_file, contents, swap):
+    sections = {}
+    for (name, typecode, offset, length) in contents:
+        values = array(typecode)
+        input_file.seek(offset)
+        values.fromfile(input_file, length)
+        if swap:
+            values.byteswap()
+        sections[name] = values
+    return sections
+
+
+def load(path):
+    '''Loads a snapshot saved by `save_fptree`, `save_relim_input` or
+       `save_sam_input`. The table of contents and the item dictionary are
+       unpickled, so only load snapshots from trusted sources.
+
+       :param path: path of the snapshot.
+       :rtype: The input of the algorithm the snapshot was saved from.
+    '''
+    with open(path, 'rb') as input_file:
+        header = input_file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError('Not a pymining snapshot: {0}'.format(path))
+        (magic, version, toc_offset, _) = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError('Not a pymining snapshot: {0}'.format(path))
+        if version != VERSION:
+            raise ValueError(
+                'Unsupported snapshot version: {0}'.format(version))
+        input_file.seek(toc_offset)
+        toc = pickle.load(input_file)
+        loader = _LOADERS[toc['kind']]
+        swap = toc['byteorder'] != sys.byteorder
+        sections = _read_sections(input_file, toc['sections'], swap)
+    return _rebuild(loader, toc['keys'], sections)
+
+
+def _rebuild(loader, keys, sections):
+    # The rebuilt structures only contain live objects: garbage collections
+    # triggered by their allocations would scan them for nothing and more
+    # than double the loading time of a large tree. The collector is
+    # disabled for the whole process, so other threads don't collect
+    # cycles during the load either.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return loader(keys, sections)
+    finally:
+        if enabled:
+            gc.enable()
@@ -0,0 +1,234 @@
+'''Inputs of the itemset miners computed from CSR matrices.
+
+A CSR (compressed sparse row) matrix stores transactions as two buffers:
+the items of row i are ``indices[indptr[i]:indptr[i + 1]]``. The functions of
+this module accept a SciPy sparse matrix (any object with `indptr` and
+`indices` attributes) or the two buffers (NumPy arrays, `array.array`,
+memoryviews or lists). Column indices are the item keys unless `labels` are
+given. Stored values are ignored: call `eliminate_zeros` on a SciPy matrix
+storing explicit zeros.
+
+If NumPy is available, duplicate items in a row are removed, the item
+frequencies are counted, the rows are sorted by item frequency and identical
+rows are grouped with vectorized operations on the buffers. Only the
+distinct rows are then converted to the tuples used by the miners, so the
+matrix is never converted to Python sets. Without NumPy, the rows are read
+one at a time from the buffers.
+'''
+from collections import defaultdict
+from operator import itemgetter
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pymining.compat import range
+from pymining.instrumentation import phase
+from pymining.itemmining import (
+    _get_key_frequencies, _sort_key_seqs, _build_sam_input,
+    _build_relim_input, _build_fptree)
+
+
+def _get_buffers(csr, indices):
+    if indices is not None:
+        return (csr, indices)
+    if getattr(csr, 'format', 'csr') != 'csr' and hasattr(csr, 'tocsr'):
+        # e.g., a CSC or COO SciPy matrix
+        csr = csr.tocsr()
+    try:
+        return (csr.indptr, csr.indices)
+    except AttributeError:
+        raise ValueError(
+            'Expected a CSR matrix or indptr and indices buffers')
+
+
+def _python_sorted_seqs(
+        indptr, indices, labels, weights, reverse_int, reverse_ext,
+        sort_ext):
+    key_seqs = defaultdict(int)
+    for row in range(len(indptr) - 1):
+        weight = 1 if weights is None else weights[row]
+        items = indices[indptr[row]:indptr[row + 1]]
+        if labels is None:
+            key_seqs[frozenset(items)] += weight
+        else:
+            key_seqs[frozenset(labels[item] for item in items)] += weight
+    frequencies = _get_key_frequencies(key_seqs)
+    asorted_seqs = _sort_key_seqs(
+        key_seqs, frequencies, reverse_int, reverse_ext, sort_ext)
+    return (asorted_seqs, frequencies)
+
+
+def _sort_pairs(rows, values, size, unique=False):
+    # Sorts the (row, value) pairs with 0 <= value < size.
+    if len(rows) and (int(rows[-1]) + 1) * size < 2 ** 62:
+        # Sorting a single key is much faster than lexsort.
+        keys = numpy.sort(rows.astype(numpy.int64) * size + values)
+        if unique and len(keys) > 1:
+            kept = numpy.ones(len(keys), dtype=bool)
+            kept[1:] = keys[1:] != keys[:-1]
+            keys = keys[kept]
+        return (keys // size, keys % size)
+    order = numpy.lexsort((values, rows))
+    rows = rows[order]
+    values = values[order]
+    if unique:
+        kept = numpy.ones(len(values), dtype=bool)
+        kept[1:] = (rows[1:] != rows[:-1]) | (values[1:] != values[:-1])
+        rows = rows[kept]
+        values = values[kept]
+    return (rows, values)
+
+
+def _numpy_sorted_seqs(
+        indptr, indices, labels, weights, reverse_int, reverse_ext,
+        sort_ext):
+    indptr = numpy.asarray(indptr, dtype=numpy.int64)
+    indices = numpy.asarray(indices)
+    row_number = len(indptr) - 1
+    if row_number <= 0:
+        return ([], {})
+    columns = indices[indptr[0]:indptr[-1]]
+    rows = numpy.repeat(numpy.arange(row_number), numpy.diff(indptr))
+    if weights is None:
+        row_weights = numpy.ones(row_number, dtype=numpy.int64)
+    else:
+        row_weights = numpy.asarray(weights, dtype=numpy.int64)
+        kept = row_weights[rows] != 0
+        rows = rows[kept]
+        columns = columns[kept]
+
+    # Removes the duplicate items of each row (SciPy allows unsorted and
+    # duplicate indices).
+    if len(columns) > 1:
+        same_row = rows[1:] == rows[:-1]
+        if numpy.any(same_row & (columns[1:] <= columns[:-1])):
+            (rows, columns) = _sort_pairs(
+                rows, columns, int(columns.max()) + 1, unique=True)
+    if not len(columns):
+        return ([], {})
+
+    if weights is None:
+        column_frequencies = numpy.bincount(columns)
+    else:
+        column_frequencies = numpy.zeros(
+            int(columns.max()) + 1, dtype=numpy.int64)
+        numpy.add.at(column_frequencies, columns, row_weights[rows])
+    present = numpy.flatnonzero(column_frequencies)
+
+    # Ranks the items by (frequency, key) like _sort_key_seqs, so the order
+    # of the items is the same with or without NumPy.
+    items = [
+        (frequency, column if labels is None else labels[column])
+        for (frequency, column) in zip(
+            column_frequencies[present].tolist(), present.tolist())]
+    order = sorted(range(len(items)), key=items.__getitem__)
+    ranked_items = [items[index] for index in order]
+    ranks = numpy.zeros(len(column_frequencies), dtype=numpy.int64)
+    ranks[present[order]] = numpy.arange(len(order))
+    frequencies = dict((key, frequency) for (frequency, key) in items)
+
+    column_ranks = ranks[columns]
+    if reverse_int:
+        column_ranks = len(order) - 1 - column_ranks
+        ranked_items.reverse()
+    (rows, column_ranks) = _sort_pairs(rows, column_ranks, len(order))
+    row_lengths = numpy.bincount(rows, minlength=row_number)
+    ends = numpy.cumsum(row_lengths)
+    starts = ends - row_lengths
+
+    # Groups identical rows by their bytes: {bytes: [start, end, weight]}
+    data = column_ranks.tobytes()
+    itemsize = column_ranks.itemsize
+    groups = {}
+    for (start, end, weight) in zip(
+            starts.tolist(), ends.tolist(), row_weights.tolist()):
+        if start == end:
+            continue
+        row = data[start * itemsize:end * itemsize]
+        try:
+            groups[row][2] += weight
+        except KeyError:
+            groups[row] = [start, end, weight]
+
+    column_ranks = column_ranks.tolist()
+    get_item = ranked_items.__getitem__
+    asorted_seqs = [
+        (tuple(map(get_item, column_ranks[start:end])), weight)
+        for (start, end, weight) in groups.values() if weight]
+    if sort_ext:
+        asorted_seqs.sort(key=itemgetter(0), reverse=reverse_ext)
+    return (asorted_seqs, frequencies)
+
+
+def _sort_csr_by_freq(
+        csr, indices=None, labels=None, weights=None, reverse_int=False,
+        reverse_ext=False, sort_ext=True):
+    (indptr, indices) = _get_buffers(csr, indices)
+    if numpy is not None:
+        sorted_seqs = _numpy_sorted_seqs
+    else:
+        sorted_seqs = _python_sorted_seqs
+    return sorted_seqs(
+        indptr, indices, labels, weights, reverse_int, reverse_ext, sort_ext)
+
+
+def get_sam_input(csr, indices=None, labels=None, weights=None, stats=None):
+    '''Given a CSR matrix of transactions, returns a data structure used as
+       the input of the sam algorithm.
+
+       :param csr: a CSR matrix or its indptr buffer.
+       :param indices: the indices buffer if `csr` is an indptr buffer.
+       :param labels: a sequence of the keys of the columns. By default, the
+        keys are the column indices.
+       :param weights: an optional sequence of row counts.
+       :param stats: an optional `MiningStats` timing the sort and build
+        phases.
+    '''
+    with phase(stats, 'sort'):
+        (asorted_seqs, _) = _sort_csr_by_freq(csr, indices, labels, weights)
+
+    with phase(stats, 'build'):
+        return _build_sam_input(asorted_seqs)
+
+
+def get_relim_input(
+        csr, indices=None, labels=None, weights=None, stats=None):
+    '''Given a CSR matrix of transactions, returns a data structure used as
+       the input of the relim algorithm.
+
+       :param csr: see `get_sam_input`.
+       :param indices: see `get_sam_input`.
+       :param labels: see `get_sam_input`.
+       :param weights: see `get_sam_input`.
+       :param stats: see `get_sam_input`.
+    '''
+    with phase(stats, 'sort'):
+        (asorted_seqs, frequencies) = _sort_csr_by_freq(
+            csr, indices, labels, weights)
+
+    with phase(stats, 'build'):
+        return _build_relim_input(asorted_seqs, frequencies)
+
+
+def get_fptree(
+        csr, indices=None, min_support=2, labels=None, weights=None,
+        stats=None):
+    '''Given a CSR matrix of transactions, returns a data structure used as
+       the input of the fpgrowth algorithm.
+
+       :param csr: see `get_sam_input`.
+       :param indices: see `get_sam_input`.
+       :param min_support: minimum support.
+       :param labels: see `get_sam_input`.
+       :param weights: see `get_sam_input`.
+       :param stats: an optional `MiningStats` timing the sort and build
+        phases and counting the allocated nodes.
+    '''
+    with phase(stats, 'sort'):
+        (asorted_seqs, _) = _sort_csr_by_freq(
+            csr, indices, labels, weights, True, False, False)
+
+    with phase(stats, 'build'):
+        return _build_fptree(asorted_seqs, min_support, stats)
@@ -0,0 +1,37 @@
+import unittest
+from pymining import bench
+
+
+class TestBench(unittest.TestCase):
+
+    def test_run_benchmarks(self):
+        grid = {
+            'transactions': [50], 'density': [0.2], 'support': [0.1],
+            'avg_length': [4]}
+        results = bench.run_benchmarks(
+            grid, ['relim', 'sam', 'fpgrowth', 'freq_seq'], seed=1)
+        self.assertEqual(4, len(results))
+        for result in results:
+            self.assertEqual(5, result['min_support'])
+            self.assertTrue(result['time'] >= 0)
+        counts = {result['count'] for result in results[:3]}
+        self.assertEqual(1, len(counts))
+
+    def test_compare_results(self):
+        baseline = [{
+            'algorithm': 'relim', 'transactions': 50, 'density': 0.2,
+            'avg_length': 4, 'support': 0.1, 'time': 1.0,
+            'peak_memory': 1000, 'count': 10}]
+        current = [dict(baseline[0], time=1.1, peak_memory=2000)]
+        regressions = bench.compare_results(baseline, current)
+        self.assertEqual(1, len(regressions))
+        self.assertEqual('peak_memory', regressions[0][1])
+
+        current = [dict(baseline[0], count=9)]
+        regressions = bench.compare_results(baseline, current)
+        self.assertEqual([(regressions[0][0], 'count', 10, 9)], regressions)
+
+    def test_quest_small_universe(self):
+        for kind in ('transactions', 'sequences', 'itemset_sequences'):
+            dataset = bench.get_dataset(kind, 100, 0.9, 2, 0, 'quest')
+            self.assertEqual(100, len(dataset))
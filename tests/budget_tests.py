@@ -0,0 +1,120 @@
+import unittest
+from pymining import itemmining, seqmining, perftesting
+from pymining.budget import CancellationToken, MiningBudget
+
+
+class TestBudget(unittest.TestCase):
+
+    def _get_inputs(self):
+        ts = perftesting.get_default_transactions()
+        return [
+            (itemmining.sam, itemmining.get_sam_input(ts)),
+            (itemmining.relim, itemmining.get_relim_input(ts)),
+            (itemmining.fpgrowth, itemmining.get_fptree(ts)),
+        ]
+
+    def test_complete(self):
+        for (miner, mining_input) in self._get_inputs():
+            budget = MiningBudget(time_limit=60, max_itemsets=18)
+            report = miner(mining_input, 2, budget=budget)
+            self.assertEqual(17, len(report))
+            self.assertTrue(budget.complete)
+            self.assertEqual(None, budget.suggested_support)
+
+    def test_exact_max_itemsets(self):
+        runs = [(miner, mining_input, 17)
+                for (miner, mining_input) in self._get_inputs()]
+        runs.append((
+            seqmining.freq_seq_enum, perftesting.get_default_sequences(), 17))
+        runs.append((
+            seqmining.freq_itemset_seq_enum,
+            perftesting.get_default_itemset_sequences(), 53))
+        for (miner, mining_input, count) in runs:
+            budget = MiningBudget(max_itemsets=count)
+            self.assertEqual(count, len(miner(mining_input, 2, budget=budget)))
+            self.assertTrue(budget.complete)
+            self.assertEqual(None, budget.suggested_support)
+
+    def test_max_itemsets(self):
+        ts = perftesting.get_default_transactions()
+        complete = itemmining.relim(itemmining.get_relim_input(ts), 2)
+        for (miner, mining_input) in self._get_inputs():
+            budget = MiningBudget(max_itemsets=5)
+            report = miner(mining_input, 2, budget=budget)
+            self.assertEqual(5, len(report))
+            self.assertFalse(budget.complete)
+            self.assertEqual('max_itemsets', budget.reason)
+            self.assertTrue(budget.suggested_support > 2)
+            for itemset in report:
+                self.assertEqual(complete[itemset], report[itemset])
+
+    def test_reused(self):
+        ts = perftesting.get_default_transactions()
+        seqs = perftesting.get_default_sequences()
+        runs = [
+            (itemmining.sam, lambda: itemmining.get_sam_input(ts)),
+            (itemmining.relim, lambda: itemmining.get_relim_input(ts)),
+            (itemmining.fpgrowth, lambda: itemmining.get_fptree(ts)),
+            (seqmining.freq_seq_enum, lambda: seqs),
+            (seqmining.freq_itemset_seq_enum,
+             perftesting.get_default_itemset_sequences),
+        ]
+        for (miner, get_input) in runs:
+            budget = MiningBudget(max_itemsets=5)
+            miner(get_input(), 2, budget=budget)
+            self.assertFalse(budget.complete)
+            # A second run that fits in the budget is complete.
+            budget.max_itemsets = None
+            miner(get_input(), 2, budget=budget)
+            self.assertTrue(budget.complete)
+            self.assertEqual(None, budget.reason)
+            self.assertEqual(None, budget.suggested_support)
+
+    def test_cancelled(self):
+        token = CancellationToken()
+        token.cancel()
+        for (miner, mining_input) in self._get_inputs():
+            budget = MiningBudget(token=token)
+            report = miner(mining_input, 2, budget=budget)
+            self.assertEqual(0, len(report))
+            self.assertEqual('cancelled', budget.reason)
+            self.assertEqual(None, budget.suggested_support)
+
+    def test_time_limit(self):
+        budget = MiningBudget(time_limit=0)
+        report = itemmining.mine_itemsets(
+            perftesting.get_default_transactions(), 2, budget=budget)
+        self.assertEqual(0, len(report))
+        self.assertFalse(budget.complete)
+        self.assertEqual('time_limit', budget.reason)
+
+    def test_memory_limit(self):
+        budget = MiningBudget(memory_limit=1, check_interval=1)
+        seqs = perftesting.get_default_sequences()
+        freq_seqs = seqmining.freq_seq_enum(seqs, 2, budget=budget)
+        self.assertEqual(0, len(freq_seqs))
+        self.assertEqual('memory_limit', budget.reason)
+
+    def test_freq_seq_enum(self):
+        seqs = perftesting.get_default_sequences()
+        budget = MiningBudget(max_itemsets=10)
+        freq_seqs = seqmining.freq_seq_enum(seqs, 2, budget=budget)
+        self.assertEqual(10, len(freq_seqs))
+        self.assertFalse(budget.complete)
+        self.assertTrue(budget.suggested_support > 2)
+
+        seqs = perftesting.get_default_itemset_sequences()
+        budget = MiningBudget(max_itemsets=10)
+        freq_seqs = seqmining.freq_itemset_seq_enum(seqs, 2, budget=budget)
+        self.assertEqual(10, len(freq_seqs))
+        self.assertEqual('max_itemsets', budget.reason)
+
+    def test_suggested_support(self):
+        budget = MiningBudget(max_itemsets=4)
+        budget.start_search(4)
+        budget.advance()
+        budget.advance()
+        # Half of the search: only the 2 sets with the highest supports
+        # would fit in 4 sets.
+        budget.finish([7, 5, 3, 3], 2)
+        self.assertEqual(5, budget.suggested_support)
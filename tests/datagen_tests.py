@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pymining import datagen, itemmining
+
+
+class TestDataGen(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_quest_transactions(self):
+        ts1 = list(datagen.quest_transactions(2000, n_items=100, seed=3))
+        ts2 = list(datagen.quest_transactions(2000, n_items=100, seed=3))
+        self.assertEqual(ts1, ts2)
+        self.assertEqual(2000, len(ts1))
+        avg_length = sum(len(t) for t in ts1) / float(len(ts1))
+        self.assertTrue(7 < avg_length < 13)
+        self.assertTrue(all(0 <= i < 100 for t in ts1 for i in t))
+
+        # Planted patterns produce frequent item sets larger than pairs.
+        report = itemmining.relim(itemmining.get_relim_input(ts1), 100)
+        self.assertTrue(max(len(iset) for iset in report) > 2)
+
+    def test_quest_sequences(self):
+        seqs = list(datagen.quest_sequences(200, n_items=50, seed=3))
+        self.assertEqual(200, len(seqs))
+        self.assertTrue(all(seq and all(seq) for seq in seqs))
+        self.assertEqual(
+            seqs, list(datagen.quest_sequences(200, n_items=50, seed=3)))
+
+    def test_few_items(self):
+        # Drawn lengths larger than the number of items are capped.
+        ts = list(datagen.quest_transactions(10, n_items=5, seed=1))
+        self.assertEqual(10, len(ts))
+        self.assertTrue(all(0 < len(t) <= 5 for t in ts))
+        ts = list(datagen.quest_transactions(
+            50, n_items=3, avg_length=10, n_patterns=1, seed=1))
+        self.assertEqual(50, len(ts))
+
+        seqs = list(datagen.quest_sequences(
+            10, n_items=2, avg_element_length=4, seed=1))
+        self.assertEqual(10, len(seqs))
+        self.assertTrue(
+            all(0 < len(element) <= 2 for seq in seqs for element in seq))
+
+    def test_chunks(self):
+        chunks = list(datagen.chunks(range(10), 4))
+        self.assertEqual([[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]], chunks)
+
+    def test_write_read(self):
+        path = os.path.join(self.directory, 'transactions.txt')
+        ts = list(datagen.quest_transactions(100, seed=1))
+        datagen.write_transactions(iter(ts), path)
+        self.assertEqual(ts, list(datagen.read_transactions(path)))
+
+        path = os.path.join(self.directory, 'sequences.txt')
+        seqs = list(datagen.quest_sequences(100, seed=1))
+        datagen.write_sequences(iter(seqs), path)
+        self.assertEqual(seqs, list(datagen.read_sequences(path)))
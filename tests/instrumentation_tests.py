@@ -0,0 +1,52 @@
+import unittest
+from pymining import itemmining, seqmining, perftesting
+from pymining.instrumentation import MiningStats
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def setUp(self):
+        self.progress = []
+        self.stats = MiningStats(self._progress, progress_interval=0)
+
+    def _progress(self, done, total, elapsed, eta):
+        self.progress.append((done, total))
+        self.assertTrue(eta >= 0)
+
+    def test_relim(self):
+        ts = perftesting.get_default_transactions()
+        relim_input = itemmining.get_relim_input(ts, stats=self.stats)
+        report = itemmining.relim(relim_input, 2, self.stats)
+        self.assertEqual(17, len(report))
+        self.assertEqual(
+            ['sort', 'build', 'search'], list(self.stats.timings))
+        self.assertEqual(3, self.stats.max_depth)
+        self.assertEqual(17, self.stats.conditional_databases)
+        self.assertEqual((5, 5), self.progress[-1])
+
+    def test_sam(self):
+        ts = perftesting.get_default_transactions()
+        sam_input = itemmining.get_sam_input(ts, stats=self.stats)
+        report = itemmining.sam(sam_input, 2, self.stats)
+        self.assertEqual(17, len(report))
+        self.assertEqual(3, self.stats.max_depth)
+        self.assertEqual((5, 5), self.progress[-1])
+
+    def test_fpgrowth(self):
+        ts = perftesting.get_default_transactions()
+        fptree = itemmining.get_fptree(ts, stats=self.stats)
+        self.assertEqual(13, self.stats.nodes)
+        report = itemmining.fpgrowth(fptree, 2, stats=self.stats)
+        self.assertEqual(17, len(report))
+        self.assertEqual(17, self.stats.conditional_databases)
+        self.assertTrue(self.stats.nodes > 13)
+        self.assertTrue(self.stats.pruned > 0)
+        self.assertEqual((5, 5), self.progress[-1])
+
+    def test_freq_seq_enum(self):
+        seqs = perftesting.get_default_sequences()
+        freq_seqs = seqmining.freq_seq_enum(seqs, 2, self.stats)
+        self.assertEqual(17, len(freq_seqs))
+        self.assertEqual(4, self.stats.max_depth)
+        self.assertEqual((3, 3), self.progress[-1])
+        self.assertEqual(17, self.stats.as_dict()['conditional_databases'])
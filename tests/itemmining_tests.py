@@ -1,5 +1,5 @@
 import unittest
-from pymining import itemmining, perftesting
+from pymining import itemmining, perftesting, instrumentation
 
 
 class TestItemSetAlgo(unittest.TestCase):
@@ -55,3 +55,103 @@ class TestItemSetAlgo(unittest.TestCase):
         report = itemmining.fpgrowth(fp_input, 2, pruning=False)
         self.assertEqual(19, len(report))
         self.assertEqual(5, report[frozenset(['a', 'b'])])
+
+    def test_mine_itemsets(self):
+        ts1 = perftesting.get_default_transactions()
+        for algorithm in ('auto',) + itemmining.ALGORITHMS:
+            report = itemmining.mine_itemsets(ts1, 2, algorithm)
+            self.assertEqual(17, len(report))
+            self.assertEqual(6, report[frozenset(['b', 'd'])])
+
+        self.assertRaises(
+            ValueError, itemmining.mine_itemsets, ts1, 2, 'apriori')
+
+    def test_mine_itemsets_auto(self):
+        stats = instrumentation.MiningStats()
+        ts1 = perftesting.get_default_transactions()
+        itemmining.mine_itemsets(ts1, 2, stats=stats)
+        self.assertEqual('sam', stats.info['algorithm'])
+        self.assertAlmostEqual(
+            0.2, stats.info['dataset']['duplicate_ratio'])
+        self.assertEqual(5, stats.info['dataset']['frequent_items'])
+
+        # Only two frequent items.
+        ts2 = [(i, i + 1000, 1, 2) for i in range(50)]
+        report = itemmining.mine_itemsets(ts2, 2, stats=stats)
+        self.assertEqual('fpgrowth', stats.info['algorithm'])
+        self.assertEqual(3, len(report))
+
+        ts3 = [(i, i + 1, i + 2, i % 10 + 100) for i in range(90)]
+        itemmining.mine_itemsets(ts3, 2, stats=stats)
+        self.assertEqual('relim', stats.info['algorithm'])
+
+    def test_get_dataset_stats(self):
+        ts1 = perftesting.get_default_transactions()
+        dataset_stats = itemmining.get_dataset_stats(ts1, 5)
+        self.assertEqual(10, dataset_stats['transactions'])
+        self.assertEqual(5, dataset_stats['items'])
+        self.assertAlmostEqual(2.8, dataset_stats['avg_length'])
+        self.assertAlmostEqual(0.56, dataset_stats['density'])
+        self.assertEqual(3, dataset_stats['frequent_items'])
+
+    def test_constraints(self):
+        ts1 = perftesting.get_default_transactions()
+        full = itemmining.mine_itemsets(ts1, 2, 'relim')
+
+        def expected(predicate):
+            return {iset: s for (iset, s) in full.items() if predicate(iset)}
+
+        for algorithm in itemmining.ALGORITHMS:
+            report = itemmining.mine_itemsets(
+                ts1, 2, algorithm, min_len=2, max_len=2)
+            self.assertEqual(expected(lambda i: len(i) == 2), report)
+
+            report = itemmining.mine_itemsets(
+                ts1, 2, algorithm, must_contain=['e'], exclude=['d'])
+            self.assertEqual(
+                {frozenset(['e']): 3, frozenset(['b', 'e']): 2,
+                 frozenset(['c', 'e']): 2}, report)
+
+            report = itemmining.mine_itemsets(
+                ts1, 2, algorithm, antimonotone=lambda i: 'a' not in i,
+                monotone=lambda i: 'b' in i)
+            self.assertEqual(
+                expected(lambda i: 'a' not in i and 'b' in i), report)
+
+    def test_constraints_prune_search(self):
+        ts1 = perftesting.get_default_transactions()
+        stats = instrumentation.MiningStats()
+        relim_input = itemmining.get_relim_input(ts1)
+        itemmining.relim(relim_input, 2, stats, max_len=1)
+        self.assertEqual(1, stats.calls)
+
+        stats = instrumentation.MiningStats()
+        fptree = itemmining.get_fptree(ts1)
+        report = itemmining.fpgrowth(fptree, 2, stats=stats, max_len=1)
+        self.assertEqual(5, len(report))
+        self.assertEqual(0, stats.conditional_databases)
+
+    def test_weighted(self):
+        ts1 = perftesting.get_default_transactions()
+        weighted = [(('b', 'c'), 2)] + [
+            (t, 1) for t in ts1 if t != ('b', 'c')] + [(('a', 'e'), 0)]
+
+        sam_input = itemmining.get_sam_input(weighted, weighted=True)
+        self.assertEqual(8, len(sam_input))
+        report = itemmining.sam(sam_input, 2)
+        self.assertEqual(itemmining.sam(itemmining.get_sam_input(ts1)), report)
+
+        relim_input = itemmining.get_relim_input(weighted, weighted=True)
+        report = itemmining.relim(relim_input, 2)
+        self.assertEqual(17, len(report))
+        self.assertEqual(6, report[frozenset(['b', 'd'])])
+
+        fptree = itemmining.get_fptree(weighted, weighted=True)
+        report = itemmining.fpgrowth(fptree, 2)
+        self.assertEqual(17, len(report))
+        self.assertEqual(6, report[frozenset(['b', 'd'])])
+
+        ts2 = [(t, 1000) for t in ts1]
+        report = itemmining.mine_itemsets(ts2, 2000, weighted=True)
+        self.assertEqual(17, len(report))
+        self.assertEqual(6000, report[frozenset(['b', 'd'])])
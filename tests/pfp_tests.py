@@ -0,0 +1,73 @@
+import random
+import shutil
+import tempfile
+import unittest
+from pymining import itemmining, pfp, perftesting
+
+
+class TestPFP(unittest.TestCase):
+
+    def _fpgrowth(self, transactions, min_support):
+        fptree = itemmining.get_fptree(transactions, min_support=min_support)
+        return itemmining.fpgrowth(fptree, min_support)
+
+    def test_get_shards(self):
+        ts = (('a', 'b', 'c'), ('b',), ('a',), ('a', 'c', 'd'))
+        shards = pfp.get_shards(ts, 2, 2)
+        # F-list: a (3), c (2), b (2)
+        self.assertEqual(['a', 'b'], shards[0]['group'])
+        self.assertEqual(['c'], shards[1]['group'])
+        self.assertEqual(
+            sorted([(('a', 'c', 'b'), 1), (('b',), 1), (('a',), 1),
+                    (('a',), 1)]),
+            sorted(shards[0]['transactions']))
+        self.assertEqual(
+            [(('a', 'c'), 1), (('a', 'c'), 1)], shards[1]['transactions'])
+
+    def test_serial(self):
+        ts = perftesting.get_default_transactions()
+        expected = self._fpgrowth(ts, 2)
+        for shard_number in (1, 2, 3, 10):
+            self.assertEqual(expected, pfp.pfpgrowth(ts, 2, shard_number))
+
+    def test_random(self):
+        rng = random.Random(1)
+        for _ in range(20):
+            ts = [tuple(rng.sample(range(12), rng.randint(1, 7)))
+                  for _ in range(rng.randint(1, 60))]
+            min_support = rng.randint(1, 5)
+            expected = self._fpgrowth(ts, min_support)
+            for shard_number in (2, 5):
+                report = pfp.pfpgrowth(
+                    ts, min_support, shard_number, pruning=True)
+                self.assertEqual(expected, report)
+
+    def test_weighted(self):
+        ts = perftesting.get_default_transactions()
+        weighted = [(t, 3) for t in ts]
+        expected = dict(
+            (itemset, support * 3)
+            for (itemset, support) in self._fpgrowth(ts, 2).items())
+        self.assertEqual(
+            expected, pfp.pfpgrowth(weighted, 6, 3, weighted=True))
+
+    def test_process_transport(self):
+        ts = perftesting.get_default_transactions()
+        report = pfp.pfpgrowth(ts, 2, 3, pfp.ProcessTransport(2))
+        self.assertEqual(self._fpgrowth(ts, 2), report)
+
+    def test_directory_transport(self):
+        directory = tempfile.mkdtemp()
+        try:
+            ts = perftesting.get_default_transactions()
+            transport = pfp.DirectoryTransport(directory, workers=2)
+            report = pfp.pfpgrowth(ts, 2, 3, transport)
+            self.assertEqual(self._fpgrowth(ts, 2), report)
+
+            # Workers started separately.
+            shards = pfp.get_shards(ts, 2, 2)
+            transport = pfp.DirectoryTransport(directory, timeout=0)
+            self.assertRaises(RuntimeError, transport.run, shards)
+            self.assertEqual(2, pfp.work(directory))
+        finally:
+            shutil.rmtree(directory)
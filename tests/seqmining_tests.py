@@ -0,0 +1,44 @@
+import unittest
+from pymining import seqmining, perftesting
+
+
+class TestSeqMining(unittest.TestCase):
+
+    def test_freq_seq_enum(self):
+        seqs = perftesting.get_default_sequences()
+        freq_seqs = seqmining.freq_seq_enum(seqs, 2)
+        self.assertEqual(17, len(freq_seqs))
+        self.assertTrue((('c', 'a', 'b', 'c'), 2) in freq_seqs)
+
+    def test_freq_itemset_seq_enum(self):
+        seqs = perftesting.get_default_itemset_sequences()
+        freq_seqs = seqmining.freq_itemset_seq_enum(seqs, 2)
+        self.assertEqual(53, len(freq_seqs))
+        self.assertTrue(((('a', 'b'), ('c',)), 2) in freq_seqs)
+        self.assertTrue(((('a',), ('b', 'c'), ('a',)), 2) in freq_seqs)
+        self.assertTrue(((('d',), ('c',), ('b',)), 2) in freq_seqs)
+        self.assertFalse(any(
+            element == ('g',) for (seq, _) in freq_seqs for element in seq))
+
+    def test_freq_itemset_seq_enum_single_items(self):
+        seqs = perftesting.get_default_sequences()
+        itemset_seqs = [[(item,) for item in seq] for seq in seqs]
+        freq_seqs = seqmining.freq_itemset_seq_enum(itemset_seqs, 2)
+        flattened = {
+            (tuple(element[0] for element in seq), support)
+            for (seq, support) in freq_seqs}
+        self.assertEqual(seqmining.freq_seq_enum(seqs, 2), flattened)
+
+    def test_weighted(self):
+        seqs = perftesting.get_default_sequences()
+        weighted = [(seqs[0], 2)] + [(seq, 1) for seq in seqs[1:]]
+        freq_seqs = seqmining.freq_seq_enum(weighted, 3, weighted=True)
+        self.assertTrue((('c', 'a', 'b', 'c'), 3) in freq_seqs)
+        self.assertTrue((('a',), 5) in freq_seqs)
+
+        seqs = perftesting.get_default_itemset_sequences()
+        weighted = [(seq, 10) for seq in seqs]
+        freq_seqs = seqmining.freq_itemset_seq_enum(
+            weighted, 20, weighted=True)
+        self.assertEqual(53, len(freq_seqs))
+        self.assertTrue(((('a', 'b'), ('c',)), 20) in freq_seqs)
@@ -0,0 +1,64 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pymining import itemmining, snapshot, perftesting
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'input.snapshot')
+        self.transactions = perftesting.get_default_transactions()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_fptree(self):
+        fptree = itemmining.get_fptree(self.transactions)
+        snapshot.save_fptree(fptree, self.path)
+        expected = itemmining.fpgrowth(fptree, 2)
+        loaded = snapshot.load(self.path)
+        self.assertEqual(list(fptree[1]), list(loaded[1]))
+        self.assertEqual(
+            [support for (_, support) in fptree[1].values()],
+            [support for (_, support) in loaded[1].values()])
+        self.assertEqual(
+            itemmining._count_nodes(fptree[1].values()),
+            itemmining._count_nodes(loaded[1].values()))
+        self.assertEqual(expected, itemmining.fpgrowth(loaded, 2))
+        self.assertEqual(
+            expected, itemmining.fpgrowth(loaded, 2, pruning=True))
+
+    def test_deep_fptree(self):
+        transactions = [tuple(range(500)), tuple(range(0, 500, 2))]
+        fptree = itemmining.get_fptree(transactions, min_support=1)
+        snapshot.save_fptree(fptree, self.path)
+        loaded = snapshot.load(self.path)
+        depth = 0
+        node = loaded[0]
+        while node.children:
+            node = node.children[min(node.children)]
+            depth += 1
+        self.assertEqual(500, depth)
+        self.assertEqual(2, loaded[1][0][1])
+
+    def test_relim_input(self):
+        relim_input = itemmining.get_relim_input(self.transactions)
+        snapshot.save_relim_input(relim_input, self.path)
+        loaded = snapshot.load(self.path)
+        self.assertEqual(relim_input, loaded)
+        self.assertEqual(17, len(itemmining.relim(loaded, 2)))
+
+    def test_sam_input(self):
+        sam_input = itemmining.get_sam_input(self.transactions)
+        snapshot.save_sam_input(sam_input, self.path)
+        loaded = snapshot.load(self.path)
+        self.assertEqual(sam_input, loaded)
+        self.assertEqual(17, len(itemmining.sam(loaded, 2)))
+
+    def test_invalid(self):
+        with open(self.path, 'wb') as output:
+            output.write(b'not a snapshot')
+        self.assertRaises(ValueError, snapshot.load, self.path)
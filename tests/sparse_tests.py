@@ -0,0 +1,90 @@
+from array import array
+import random
+import unittest
+from pymining import itemmining, sparse, perftesting
+
+
+class CSRMatrix(object):
+    '''Has the attributes of a SciPy CSR matrix read by the adapters.'''
+
+    format = 'csr'
+
+    def __init__(self, indptr, indices):
+        self.indptr = indptr
+        self.indices = indices
+
+
+def _to_csr(transactions):
+    columns = sorted(set(item for t in transactions for item in t))
+    column_ids = dict((item, i) for (i, item) in enumerate(columns))
+    indptr = [0]
+    indices = []
+    for transaction in transactions:
+        indices.extend(column_ids[item] for item in transaction)
+        indptr.append(len(indices))
+    return (indptr, indices, columns)
+
+
+class TestSparse(unittest.TestCase):
+
+    def setUp(self):
+        self.numpy = sparse.numpy
+
+    def tearDown(self):
+        sparse.numpy = self.numpy
+
+    def _check(self):
+        ts = perftesting.get_default_transactions()
+        (indptr, indices, labels) = _to_csr(ts)
+        expected = itemmining.relim(itemmining.get_relim_input(ts), 2)
+
+        sam_input = sparse.get_sam_input(indptr, indices, labels=labels)
+        self.assertEqual(expected, itemmining.sam(sam_input, 2))
+        relim_input = sparse.get_relim_input(
+            CSRMatrix(array('i', indptr), array('i', indices)),
+            labels=labels)
+        self.assertEqual(expected, itemmining.relim(relim_input, 2))
+        fptree = sparse.get_fptree(indptr, indices, 2, labels)
+        self.assertEqual(expected, itemmining.fpgrowth(fptree, 2))
+
+        # Column indices as keys, unsorted and duplicate indices, weights
+        indptr = [0, 3, 4, 6, 6]
+        indices = [2, 0, 2, 1, 0, 2]
+        weights = [2, 5, 1, 3]
+        report = itemmining.relim(
+            sparse.get_relim_input(indptr, indices, weights=weights), 2)
+        self.assertEqual(
+            {frozenset([0]): 3, frozenset([1]): 5, frozenset([2]): 3,
+             frozenset([0, 2]): 3}, report)
+
+    def test_python(self):
+        sparse.numpy = None
+        self._check()
+
+    @unittest.skipUnless(sparse.numpy, 'NumPy is not installed')
+    def test_numpy(self):
+        self._check()
+
+    @unittest.skipUnless(sparse.numpy, 'NumPy is not installed')
+    def test_numpy_same_input(self):
+        numpy = sparse.numpy
+        rng = random.Random(1)
+        for _ in range(20):
+            ts = [[rng.randrange(15) for _ in range(rng.randint(0, 8))]
+                  for _ in range(rng.randint(1, 50))]
+            (indptr, indices, _) = _to_csr(ts)
+            for (reverse_int, sort_ext) in ((False, True), (True, False)):
+                (expected, frequencies) = sparse._python_sorted_seqs(
+                    indptr, indices, None, None, reverse_int, False,
+                    sort_ext)
+                (asorted_seqs, numpy_frequencies) = \
+                    sparse._numpy_sorted_seqs(
+                        numpy.array(indptr), numpy.array(indices), None,
+                        None, reverse_int, False, sort_ext)
+                self.assertEqual(sorted(expected), sorted(asorted_seqs))
+                if sort_ext:
+                    self.assertEqual(expected, asorted_seqs)
+                self.assertEqual(dict(frequencies), numpy_frequencies)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, sparse.get_sam_input, [0, 1])